@@ -0,0 +1,13 @@
+"""
+Replacing cache files (card atlases, strategy tables) without ever leaving
+half a file behind: the data goes to a temporary file next to the target,
+which is then renamed over it in one step.
+"""
+import os
+
+
+def write_atomically(path: str, write):
+    """Calls write(tmp_path) to produce the file, then moves it to 'path'."""
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
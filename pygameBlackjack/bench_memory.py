@@ -0,0 +1,53 @@
+"""
+Memory benchmark: plays many rounds on several headless tables whose views
+resolve every dealt card through one shared CardImageCache, the way the
+Tk Game does, and checks that memory stays flat.
+
+PhotoImages need a display, so the cache here keeps the resized PIL images.
+
+    python bench_memory.py [rounds] [tables]
+"""
+import random
+import sys
+import tracemalloc
+
+from card_images import CardImageCache
+from table_engine import TableEngine
+
+
+def attach_view(engine, registry, size=(126, 182)):
+    """A minimal view: looks up the image of every dealt card and keeps nothing itself."""
+    engine.subscribe("card", lambda person, card: registry.get(card, size))
+
+
+def play(engines, rounds):
+    for _ in range(rounds):
+        for engine in engines:
+            engine.play_round()
+
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    tables = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    registry = CardImageCache(make_photo=lambda img: img)
+    engines = [TableEngine(random.Random(seed)) for seed in range(tables)]
+    for engine in engines:
+        attach_view(engine, registry)
+
+    # Warm-up: every card has been seen and decoded once
+    play(engines, 200)
+
+    step = max(1, rounds // 5)
+    # Allocated up front so the bookkeeping itself doesn't show up as growth
+    checkpoints = [(done, 0) for done in range(step, rounds + 1, step)]
+    tracemalloc.start()
+    for i, (done, _) in enumerate(checkpoints):
+        play(engines, step)
+        checkpoints[i] = (done, tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+
+    print(f"{tables} tables, {rounds} rounds each, registry: {registry.stats()}")
+    for done, current in checkpoints:
+        print(f"after {done:6d} rounds: {current:8,d} bytes traced")
+    print(f"growth: {checkpoints[-1][1] - checkpoints[0][1]:+,d} bytes")
@@ -0,0 +1,80 @@
+"""
+Round-restart benchmark for the pygame versions: the old
+copy.deepcopy(decks * one_deck) per hand vs. the Shoe path the games run
+now, which reshuffles in place only once the cut card has come out.
+
+Between two restarts the cursor is moved past CARDS_PER_HAND cards, standing
+in for the deals of a hand, so the cut card comes out about as often as in play.
+
+    python bench_restart.py
+"""
+import copy
+import random
+import time
+import tracemalloc
+
+from shoe import Shoe
+
+cards = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+one_deck = 4 * cards
+decks = 4
+# reshuffle once 75% of the shoe has been dealt, as in v1/v2
+penetration = 0.75
+# Cards a typical hand takes out of the shoe (player + dealer)
+CARDS_PER_HAND = 5
+HANDS = 5000
+
+
+def restart_nothing(game_deck):
+    for _ in range(HANDS):
+        pass
+    return game_deck
+
+
+def restart_with_deepcopy(game_deck):
+    for _ in range(HANDS):
+        game_deck = copy.deepcopy(decks * one_deck)
+    return game_deck
+
+
+def restart_with_shoe(game_deck):
+    for _ in range(HANDS):
+        # DEAL HAND / NEW HAND in blackjack_v1 and blackjack_v2
+        if game_deck.needs_shuffle():
+            game_deck.shuffle()
+        game_deck.cursor += CARDS_PER_HAND
+    return game_deck
+
+
+def measure(fn, game_deck):
+    """
+    Runs HANDS restarts on an already built deck; returns (seconds, peak bytes,
+    retained bytes) traced above what was allocated before the run.
+    """
+    fn(game_deck)  # warm-up
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    game_deck = fn(game_deck)
+    elapsed = time.perf_counter() - start
+    # Anything a restart creates is dropped by the next one, so the peak is
+    # the largest amount of temporary memory a single restart needed
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak - baseline, current - baseline
+
+
+if __name__ == '__main__':
+    runs = (
+        # Measurement overhead (frames, tracemalloc's own bookkeeping)
+        ("empty loop", restart_nothing, None),
+        ("deepcopy per hand", restart_with_deepcopy, copy.deepcopy(decks * one_deck)),
+        ("Shoe at cut card", restart_with_shoe,
+         Shoe(one_deck, random.Random(0), decks=decks, penetration=penetration)),
+    )
+    print(f"{HANDS} restarts, {CARDS_PER_HAND} cards per hand, "
+          f"about one reshuffle every {int(decks * len(one_deck) * penetration) // CARDS_PER_HAND + 1} hands")
+    for name, fn, game_deck in runs:
+        elapsed, peak, retained = measure(fn, game_deck)
+        print(f"{name:18s} {HANDS / elapsed:10,.0f} restarts/s  "
+              f"peak {peak:6,d} bytes  retained {retained:6,d} bytes")
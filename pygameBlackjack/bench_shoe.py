@@ -0,0 +1,54 @@
+"""
+Microbenchmark: dealing a whole deck with the old random.choice + deck.remove
+pattern vs. the cursor-based Shoe.
+
+    python bench_shoe.py [decks]
+"""
+import random
+import sys
+import time
+
+from shoe import Shoe
+
+
+def build_deck(decks=1):
+    suits = ["diamonds", "clubs", "hearts", "spades"]
+    values = range(2, 15)
+    return [f"{v}_of_{s}" for s in suits for v in values] * decks
+
+
+def deal_with_list(base, repeats, rng):
+    for _ in range(repeats):
+        deck = list(base)
+        rng.shuffle(deck)
+        while deck:
+            card_name = rng.choice(deck)
+            deck.remove(card_name)
+
+
+def deal_with_shoe(base, repeats, rng):
+    shoe = Shoe(base, rng)
+    for _ in range(repeats):
+        shoe.shuffle()
+        while len(shoe):
+            shoe.deal()
+
+
+def measure(fn, base, repeats):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    fn(base, repeats, rng)
+    elapsed = time.perf_counter() - start
+    return repeats * len(base) / elapsed
+
+
+if __name__ == '__main__':
+    decks = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    base = build_deck(decks)
+    repeats = max(1, 20000 // decks)
+
+    old = measure(deal_with_list, base, repeats)
+    new = measure(deal_with_shoe, base, repeats)
+    print(f"{decks} deck(s), {len(base)} cards, {repeats} full deals each")
+    print(f"random.choice + remove: {old:12,.0f} deals/s")
+    print(f"Shoe.deal:              {new:12,.0f} deals/s  ({new / old:.1f}x)")
@@ -0,0 +1,38 @@
+"""
+Scaling benchmark for simulator.simulate(): rounds per second with 1, 2, 4, ...
+worker processes up to the core count, and a check that every worker count
+gives bit-identical counts for the same seed.
+
+    python bench_simulate.py [rounds] [policy]
+"""
+import os
+import sys
+import time
+
+from simulator import simulate
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 8_000_000
+    policy = sys.argv[2] if len(sys.argv) > 2 else "bot"
+
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    print(f"{rounds:,} rounds of '{policy}' on {cores} cores")
+    reference = None
+    base_rate = None
+    for workers in counts:
+        start = time.perf_counter()
+        result = simulate(rounds, policy, workers=workers, seed=0)
+        elapsed = time.perf_counter() - start
+        rate = rounds / elapsed
+        base_rate = base_rate or rate
+        if reference is None:
+            reference = result
+        same = "identical" if result == reference else "DIFFERENT"
+        print(f"{workers:3d} workers  {rate:12,.0f} rounds/s  x{rate / base_rate:5.2f}  "
+              f"({same})  {result.report()}")
@@ -1,19 +1,28 @@
 # black jack in python wth pygame!
-import copy
-import random
 import pygame
 
+from dirty_render import DirtyRenderer
+from scoring import HandScorer
+from shoe import Shoe
+from debug import DEBUG
+from text_cache import FrameTimer, render_text, text_cache
+
 pygame.init()
 # game variables
 cards = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 one_deck = 4 * cards
+# hard value of each rank (Ace counts as 1), for the scoring table
+hard_values = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
+               '10': 10, 'J': 10, 'Q': 10, 'K': 10, 'A': 1}
 decks = 4
+# reshuffle once 75% of the shoe has been dealt (cut card)
+penetration = 0.75
+# one shoe for the whole session, reshuffled in place when the cut card comes out
+game_deck = Shoe(one_deck, decks=decks, penetration=penetration)
 WIDTH = 600
 HEIGHT = 900
 screen = pygame.display.set_mode([WIDTH, HEIGHT])
 pygame.display.set_caption('Pygame Blackjack!')
-fps = 60
-timer = pygame.time.Clock()
 font = pygame.font.Font('freesansbold.ttf', 44)
 smaller_font = pygame.font.Font('freesansbold.ttf', 36)
 active = False
@@ -32,101 +41,119 @@ add_score = False
 results = ['', 'PLAYER BUSTED o_O', 'Player WINS! :)', 'DEALER WINS :(', 'TIE GAME...']
 
 
-# deal cards by selecting randomly from deck, and make function for one card at a time
+# deal the next card from the shuffled shoe, one card at a time
 def deal_cards(current_hand, current_deck):
-    card = random.randint(0, len(current_deck))
-    current_hand.append(current_deck[card - 1])
-    current_deck.pop(card - 1)
+    current_hand.append(current_deck.deal())
     return current_hand, current_deck
 
 
-# draw scores for player and dealer on screen
-def draw_scores(player, dealer):
-    screen.blit(font.render(f'Score[{player}]', True, 'white'), (350, 400))
-    if reveal_dealer:
-        screen.blit(font.render(f'Score[{dealer}]', True, 'white'), (350, 100))
+# screen regions, redrawn independently only when what they show changes (none overlap)
+HEADER = pygame.Rect(0, 0, WIDTH, 150)
+DEALER_AREA = pygame.Rect(0, 150, WIDTH, 250)
+PLAYER_SCORE = pygame.Rect(0, 400, WIDTH, 60)
+PLAYER_AREA = pygame.Rect(0, 460, WIDTH, 240)
+CONTROLS = pygame.Rect(0, 700, WIDTH, HEIGHT - 700)
+
+
+# draw the player's score
+def draw_player_score(player):
+    screen.blit(render_text(font, f'Score[{player}]', 'white'), (350, 400))
 
 
-# draw cards visually onto screen
-def draw_cards(player, dealer, reveal):
+# draw the player's cards visually onto screen
+def draw_player_cards(player):
     for i in range(len(player)):
         pygame.draw.rect(screen, 'white', [70 + (70 * i), 460 + (5 * i), 120, 220], 0, 5)
-        screen.blit(font.render(player[i], True, 'black'), (75 + 70 * i, 465 + 5 * i))
-        screen.blit(font.render(player[i], True, 'black'), (75 + 70 * i, 635 + 5 * i))
+        screen.blit(render_text(font, player[i], 'black'), (75 + 70 * i, 465 + 5 * i))
+        screen.blit(render_text(font, player[i], 'black'), (75 + 70 * i, 635 + 5 * i))
         pygame.draw.rect(screen, 'red', [70 + (70 * i), 460 + (5 * i), 120, 220], 5, 5)
 
+
+# draw the dealer's cards, plus the restart button on top of them once the hand is over
+def draw_dealer_area(dealer, reveal, result):
     # if player hasn't finished turn, dealer will hide one card
     for i in range(len(dealer)):
         pygame.draw.rect(screen, 'white', [70 + (70 * i), 160 + (5 * i), 120, 220], 0, 5)
         if i != 0 or reveal:
-            screen.blit(font.render(dealer[i], True, 'black'), (75 + 70 * i, 165 + 5 * i))
-            screen.blit(font.render(dealer[i], True, 'black'), (75 + 70 * i, 335 + 5 * i))
+            screen.blit(render_text(font, dealer[i], 'black'), (75 + 70 * i, 165 + 5 * i))
+            screen.blit(render_text(font, dealer[i], 'black'), (75 + 70 * i, 335 + 5 * i))
         else:
-            screen.blit(font.render('???', True, 'black'), (75 + 70 * i, 165 + 5 * i))
-            screen.blit(font.render('???', True, 'black'), (75 + 70 * i, 335 + 5 * i))
+            screen.blit(render_text(font, '???', 'black'), (75 + 70 * i, 165 + 5 * i))
+            screen.blit(render_text(font, '???', 'black'), (75 + 70 * i, 335 + 5 * i))
         pygame.draw.rect(screen, 'blue', [70 + (70 * i), 160 + (5 * i), 120, 220], 5, 5)
+    if result != 0:
+        pygame.draw.rect(screen, 'white', NEW_HAND_BUTTON, 0, 5)
+        pygame.draw.rect(screen, 'green', NEW_HAND_BUTTON, 3, 5)
+        pygame.draw.rect(screen, 'black', [153, 223, 294, 94], 3, 5)
+        screen.blit(render_text(font, 'NEW HAND', 'black'), (165, 250))
+
+
+# scores are cached per hand and only recomputed when a card is added
+player_scorer = HandScorer(hard_values)
+dealer_scorer = HandScorer(hard_values)
+
+
+# buttons
+DEAL_BUTTON = pygame.Rect(150, 20, 300, 100)
+HIT_BUTTON = pygame.Rect(0, 700, 300, 100)
+STAND_BUTTON = pygame.Rect(300, 700, 300, 100)
+NEW_HAND_BUTTON = pygame.Rect(150, 220, 300, 100)
 
 
-# pass in player or dealer hand and get best score possible
-def calculate_score(hand):
-    # calculate hand score fresh every time, check how many aces we have
-    hand_score = 0
-    aces_count = hand.count('A')
-    for i in range(len(hand)):
-        # for 2,3,4,5,6,7,8,9 - just add the number to total
-        for j in range(8):
-            if hand[i] == cards[j]:
-                hand_score += int(hand[i])
-        # for 10 and face cards, add 10
-        if hand[i] in ['10', 'J', 'Q', 'K']:
-            hand_score += 10
-        # for aces start by adding 11, we'll check if we need to reduce afterwards
-        elif hand[i] == 'A':
-            hand_score += 11
-    # determine how many aces need to be 1 instead of 11 to get under 21 if possible
-    if hand_score > 21 and aces_count > 0:
-        for i in range(aces_count):
-            if hand_score > 21:
-                hand_score -= 10
-    return hand_score
-
-
-# draw game conditions and buttons
-def draw_game(act, record, result):
-    button_list = []
+# which buttons are on screen, in the order the event handling expects
+def get_buttons(act, result):
     # initially on startup (not active) only option is to deal new hand
     if not act:
-        deal = pygame.draw.rect(screen, 'white', [150, 20, 300, 100], 0, 5)
-        pygame.draw.rect(screen, 'green', [150, 20, 300, 100], 3, 5)
-        deal_text = font.render('DEAL HAND', True, 'black')
-        screen.blit(deal_text, (165, 50))
-        button_list.append(deal)
-    # once game started, shot hit and stand buttons and win/loss records
+        button_list = [DEAL_BUTTON]
+    # once game started, show hit and stand buttons
     else:
-        hit = pygame.draw.rect(screen, 'white', [0, 700, 300, 100], 0, 5)
-        pygame.draw.rect(screen, 'green', [0, 700, 300, 100], 3, 5)
-        hit_text = font.render('HIT ME', True, 'black')
-        screen.blit(hit_text, (55, 735))
-        button_list.append(hit)
-        stand = pygame.draw.rect(screen, 'white', [300, 700, 300, 100], 0, 5)
-        pygame.draw.rect(screen, 'green', [300, 700, 300, 100], 3, 5)
-        stand_text = font.render('STAND', True, 'black')
-        screen.blit(stand_text, (355, 735))
-        button_list.append(stand)
-        score_text = smaller_font.render(f'Wins: {record[0]}   Losses: {record[1]}   Draws: {record[2]}', True, 'white')
-        screen.blit(score_text, (15, 840))
-    # if there is an outcome for the hand that was played, display a restart button and tell user what happened
+        button_list = [HIT_BUTTON, STAND_BUTTON]
+    # if there is an outcome for the hand that was played, there is a restart button
     if result != 0:
-        screen.blit(font.render(results[result], True, 'white'), (15, 25))
-        deal = pygame.draw.rect(screen, 'white', [150, 220, 300, 100], 0, 5)
-        pygame.draw.rect(screen, 'green', [150, 220, 300, 100], 3, 5)
-        pygame.draw.rect(screen, 'black', [153, 223, 294, 94], 3, 5)
-        deal_text = font.render('NEW HAND', True, 'black')
-        screen.blit(deal_text, (165, 250))
-        button_list.append(deal)
+        button_list.append(NEW_HAND_BUTTON)
     return button_list
 
 
+# draw the deal button, the outcome of the hand and the dealer's score
+def draw_header(act, result, reveal, dealer):
+    if not act:
+        pygame.draw.rect(screen, 'white', DEAL_BUTTON, 0, 5)
+        pygame.draw.rect(screen, 'green', DEAL_BUTTON, 3, 5)
+        screen.blit(render_text(font, 'DEAL HAND', 'black'), (165, 50))
+    if reveal:
+        screen.blit(render_text(font, f'Score[{dealer}]', 'white'), (350, 100))
+    # if there is an outcome for the hand that was played, tell user what happened
+    if result != 0:
+        screen.blit(render_text(font, results[result], 'white'), (15, 25))
+
+
+# draw hit and stand buttons and win/loss records once the game has started
+def draw_controls(act, record):
+    if not act:
+        return
+    pygame.draw.rect(screen, 'white', HIT_BUTTON, 0, 5)
+    pygame.draw.rect(screen, 'green', HIT_BUTTON, 3, 5)
+    screen.blit(render_text(font, 'HIT ME', 'black'), (55, 735))
+    pygame.draw.rect(screen, 'white', STAND_BUTTON, 0, 5)
+    pygame.draw.rect(screen, 'green', STAND_BUTTON, 3, 5)
+    screen.blit(render_text(font, 'STAND', 'black'), (355, 735))
+    score_text = render_text(smaller_font, f'Wins: {record[0]}   Losses: {record[1]}   Draws: {record[2]}', 'white')
+    screen.blit(score_text, (15, 840))
+
+
+# redraw only the regions whose content changed since the last frame
+def draw_frame():
+    renderer.region('header', HEADER, (active, outcome, reveal_dealer, dealer_score),
+                    draw_header, active, outcome, reveal_dealer, dealer_score)
+    if active:
+        renderer.region('dealer', DEALER_AREA, (tuple(dealer_hand), reveal_dealer, outcome),
+                        draw_dealer_area, dealer_hand, reveal_dealer, outcome)
+        renderer.region('player_score', PLAYER_SCORE, player_score, draw_player_score, player_score)
+        renderer.region('player', PLAYER_AREA, tuple(my_hand), draw_player_cards, my_hand)
+    renderer.region('controls', CONTROLS, (active, tuple(records)), draw_controls, active, records)
+    return renderer.flush()
+
+
 # check endgame conditions function
 def check_endgame(hand_act, deal_score, play_score, result, totals, add):
     # check end game scenarios is player has stood, busted or blackjacked
@@ -151,39 +178,33 @@ def check_endgame(hand_act, deal_score, play_score, result, totals, add):
     return result, totals, add
 
 
-# main game loop
+# main game loop: event driven - sleep until input arrives, handle it, run one logic
+# step that resolves everything not waiting on the player, then draw one frame
+renderer = DirtyRenderer(screen, 'black')
+# time spent drawing each frame, reported on exit with BLACKJACK_DEBUG=1
+frame_timer = FrameTimer()
+# mouse movement never changes anything, so it shouldn't wake the loop up
+pygame.event.set_blocked(pygame.MOUSEMOTION)
+draw_frame()
 run = True
 while run:
-    # run game at our framerate and fill screen with bg color
-    timer.tick(fps)
-    screen.fill('black')
-    # initial deal to player and dealer
-    if initial_deal:
-        for i in range(2):
-            my_hand, game_deck = deal_cards(my_hand, game_deck)
-            dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
-        initial_deal = False
-    # once game is activated, and dealt, calculate scores and display cards
-    if active:
-        player_score = calculate_score(my_hand)
-        draw_cards(my_hand, dealer_hand, reveal_dealer)
-        if reveal_dealer:
-            dealer_score = calculate_score(dealer_hand)
-            if dealer_score < 17:
-                dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
-        draw_scores(player_score, dealer_score)
-    buttons = draw_game(active, records, outcome)
+    events = [pygame.event.wait()] + pygame.event.get()
+    buttons = get_buttons(active, outcome)
 
     # event handling, if quit pressed, then exit game
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             run = False
+        # the window was uncovered: everything has to be drawn again
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            renderer.invalidate()
         if event.type == pygame.MOUSEBUTTONUP:
             if not active:
                 if buttons[0].collidepoint(event.pos):
                     active = True
                     initial_deal = True
-                    game_deck = copy.deepcopy(decks * one_deck)
+                    if game_deck.needs_shuffle():
+                        game_deck.shuffle()
                     my_hand = []
                     dealer_hand = []
                     outcome = 0
@@ -203,7 +224,8 @@ while run:
                     if buttons[2].collidepoint(event.pos):
                         active = True
                         initial_deal = True
-                        game_deck = copy.deepcopy(decks * one_deck)
+                        if game_deck.needs_shuffle():
+                            game_deck.shuffle()
                         my_hand = []
                         dealer_hand = []
                         outcome = 0
@@ -215,12 +237,34 @@ while run:
                         player_score = 0
 
 
-    # if player busts, automatically end turn - treat like a stand
-    if hand_active and player_score >= 21:
-        hand_active = False
-        reveal_dealer = True
+    # logic step
+    # initial deal to player and dealer
+    if initial_deal:
+        for i in range(2):
+            my_hand, game_deck = deal_cards(my_hand, game_deck)
+            dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
+        initial_deal = False
+    # once game is activated, and dealt, calculate scores
+    if active:
+        player_score = player_scorer(my_hand)
+        # if player busts, automatically end turn - treat like a stand
+        if hand_active and player_score >= 21:
+            hand_active = False
+            reveal_dealer = True
+        # dealer plays the whole hand out in this step, not one card per frame
+        if reveal_dealer:
+            dealer_score = dealer_scorer(dealer_hand)
+            while dealer_score < 17:
+                dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
+                dealer_score = dealer_scorer(dealer_hand)
 
     outcome, records, add_score = check_endgame(hand_active, dealer_score, player_score, outcome, records, add_score)
 
-    pygame.display.flip()
+    # render frame
+    frame_timer.start()
+    draw_frame()
+    frame_timer.stop()
+if DEBUG:
+    print(frame_timer.report())
+    print(f'text cache: {text_cache.hits} hits, {text_cache.misses} misses')
 pygame.quit()
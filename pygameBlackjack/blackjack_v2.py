@@ -1,8 +1,13 @@
 import pygame
-import random
-import copy
 from tkinter import *
 
+from card_atlas import atlas_rect, ensure_atlas
+from cards import BACK, BACK_PATH, CARD_HARD_VALUES, CARD_NAMES, CARD_PATHS, FULL_DECK
+from scoring import HandScorer
+from shoe import Shoe
+from debug import DEBUG
+from text_cache import FrameTimer, render_text, text_cache
+
 pygame.init()
 
 root = Tk()
@@ -10,23 +15,16 @@ root.geometry("1200x800")
 root.configure(background="green")
 
 # ---------------------- CARD & DECK SETTINGS ----------------------
-# We have 4 suits and 13 ranks
-suits = ['hearts', 'diamonds', 'clubs', 'spades']
-ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14']
-
-# Build a single deck of 52 unique cards: ['2_of_hearts', '3_of_hearts', ... , 'A_of_spades']
-base_deck = []
-for s in suits:
-    for r in ranks:
-        base_deck.append(f'{r}_of_{s}')
+# A single deck of 52 unique cards, stored as card ids 0..51 (see cards.py)
+base_deck = list(FULL_DECK)
 
 # Number of decks
 decks = 4
-# Create our full deck by multiplying
-# e.g. if decks=4 => 208 cards in total
-# We'll deep-copy it into game_deck when starting a new hand.
-# base_deck itself remains as reference
-# (You can also shuffle it if you want initially, but below we pick random cards anyway.)
+# Reshuffle once 75% of the shoe has been dealt (cut card)
+penetration = 0.75
+# One shoe of base_deck * decks cards (e.g. if decks=4 => 208 cards in total).
+# It is built once and reshuffled in place when the cut card comes out.
+game_deck = Shoe(base_deck, decks=decks, penetration=penetration)
 # ---------------------------------------------------------------
 
 # ---------------------- PYGAME WINDOW SETTINGS ----------------------
@@ -35,8 +33,6 @@ WIDTH, HEIGHT = 600, 900
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption('Pygame Blackjack (Resizable Window)')
 
-fps = 60
-clock = pygame.time.Clock()
 
 # ---------------------- FONTS ----------------------
 font = pygame.font.Font('freesansbold.ttf', 44)
@@ -65,77 +61,62 @@ results = [
 
 # ---------------------- LOAD CARD IMAGES ----------------------
 # We assume you have files like '2_of_hearts.png', '2_of_diamonds.png', etc. in images/cards/
-# We'll store them in a dict images[card_name] => pygame.Surface
-# Example of card_name: '2_of_hearts', 'K_of_spades', etc.
-
-# Load each card image
-images = {}
-for suit in suits:
-    for rank in ranks:
-        card_name = f'{rank}_of_{suit}'  # e.g. '2_of_spades'
-        path = f'images/cards/{card_name}.png'
-        try:
-            img = pygame.image.load(path).convert_alpha()
-            images[card_name] = img
-        except:
-            print(f"Warning: Could not load {path}. Please check if the file exists.")
+# We'll store them in a dict images[card_id] => pygame.Surface
+CARD_SIZE = (100, 140)
 
-# We'll also load the card back image (for hidden dealer card)
-try:
-    back_img = pygame.image.load('images/cards/back.png').convert_alpha()
-except:
-    print("Warning: Could not load images/cards/back.png.")
-    back_img = None
 
 # Optionally scale images if they're too large
 def scale_image(img, width=100, height=140):
     return pygame.transform.smoothscale(img, (width, height))
 
-for key, surf in images.items():
-    images[key] = scale_image(surf, 100, 140)
-
-if back_img:
-    back_img = scale_image(back_img, 100, 140)
 
-# ---------------------- BLACKJACK FUNCTIONS ----------------------
-def deal_cards(current_hand, current_deck):
+def load_from_atlas():
     """
-    Randomly picks a card from current_deck, appends to current_hand,
-    and removes that card from current_deck.
+    Loads every card from the sprite atlas (one file, already scaled; see card_atlas.py).
+    Each card is a subsurface of the atlas, so blitting it just copies that sub-rect.
     """
-    index = random.randint(0, len(current_deck) - 1)
-    card = current_deck[index]
-    current_hand.append(card)
-    current_deck.pop(index)
-    return current_hand, current_deck
+    atlas = pygame.image.load(ensure_atlas(CARD_SIZE)).convert_alpha()
+    faces = {card: atlas.subsurface(atlas_rect(card, CARD_SIZE)) for card in FULL_DECK}
+    return faces, atlas.subsurface(atlas_rect(BACK, CARD_SIZE))
+
+
+def load_separately():
+    """Fallback when the atlas can't be built (e.g. PIL is missing): load and scale each PNG."""
+    faces = {}
+    for card in FULL_DECK:
+        path = CARD_PATHS[card]  # e.g. 'images/cards/2_of_spades.png'
+        try:
+            faces[card] = scale_image(pygame.image.load(path).convert_alpha(), *CARD_SIZE)
+        except:
+            print(f"Warning: Could not load {path}. Please check if the file exists.")
+
+    # We'll also load the card back image (for hidden dealer card)
+    try:
+        back = scale_image(pygame.image.load(BACK_PATH).convert_alpha(), *CARD_SIZE)
+    except:
+        print("Warning: Could not load images/cards/back.png.")
+        back = None
+    return faces, back
 
 
-def calculate_score(hand):
+try:
+    images, back_img = load_from_atlas()
+except (ImportError, OSError, pygame.error) as e:
+    print(f"Warning: Could not use the card atlas ({e}); loading cards one by one.")
+    images, back_img = load_separately()
+
+# ---------------------- BLACKJACK FUNCTIONS ----------------------
+def deal_cards(current_hand, current_deck):
     """
-    Calculates the best possible blackjack score for a given hand,
-    treating Aces as 1 or 11.
+    Deals the next card of the current_deck shoe onto current_hand.
     """
-    score = 0
-    aces_count = 0
-
-    for card in hand:
-        # card is something like 'K_of_hearts', '10_of_spades', 'A_of_diamonds', ...
-        rank = card.split('_of_')[0]  # e.g. 'K', '10', 'A'
-        if rank.isdigit():
-            # For '2'..'9'
-            score += int(rank)
-        elif rank in ['10', 'J', 'Q', 'K']:
-            score += 10
-        elif rank == 'A':
-            score += 11
-            aces_count += 1
+    current_hand.append(current_deck.deal())
+    return current_hand, current_deck
 
-    # If we are over 21 and have Aces, reduce by 10 for each Ace if needed
-    while score > 21 and aces_count > 0:
-        score -= 10
-        aces_count -= 1
 
-    return score
+# Scores are cached per hand and only recomputed when a card is added
+player_scorer = HandScorer(CARD_HARD_VALUES)
+dealer_scorer = HandScorer(CARD_HARD_VALUES)
 
 
 def draw_cards(player, dealer, reveal):
@@ -153,7 +134,7 @@ def draw_cards(player, dealer, reveal):
         else:
             # If missing image, just draw a fallback rect
             pygame.draw.rect(screen, 'white', [x, y, 100, 140], 0, 5)
-            screen.blit(font.render(card, True, 'black'), (x + 5, y + 5))
+            screen.blit(render_text(font, CARD_NAMES[card], 'black'), (x + 5, y + 5))
 
     # Dealer's cards
     for i, card in enumerate(dealer):
@@ -171,7 +152,7 @@ def draw_cards(player, dealer, reveal):
                 screen.blit(images[card], (x, y))
             else:
                 pygame.draw.rect(screen, 'white', [x, y, 100, 140], 0, 5)
-                screen.blit(font.render(card, True, 'black'), (x + 5, y + 5))
+                screen.blit(render_text(font, CARD_NAMES[card], 'black'), (x + 5, y + 5))
 
 
 def draw_scores(player_val, dealer_val):
@@ -180,12 +161,12 @@ def draw_scores(player_val, dealer_val):
     draws the dealer's score only if reveal_dealer == True.
     """
     # Player's score
-    p_text = font.render(f'Score[{player_val}]', True, 'white')
+    p_text = render_text(font, f'Score[{player_val}]', 'white')
     screen.blit(p_text, (350, 400))
 
     # Dealer's score if revealed
     if reveal_dealer:
-        d_text = font.render(f'Score[{dealer_val}]', True, 'white')
+        d_text = render_text(font, f'Score[{dealer_val}]', 'white')
         screen.blit(d_text, (350, 100))
 
 
@@ -201,39 +182,39 @@ def draw_game_ui(act, record, result):
         # Show DEAL HAND button if game is not active
         deal_btn = pygame.draw.rect(screen, 'white', [150, 20, 300, 100], 0, 5)
         pygame.draw.rect(screen, 'green', [150, 20, 300, 100], 3, 5)
-        deal_text = font.render('DEAL HAND', True, 'black')
+        deal_text = render_text(font, 'DEAL HAND', 'black')
         screen.blit(deal_text, (165, 50))
         button_list.append(deal_btn)
     else:
         # If game is active, show HIT and STAND
         hit_btn = pygame.draw.rect(screen, 'white', [0, 700, 300, 100], 0, 5)
         pygame.draw.rect(screen, 'green', [0, 700, 300, 100], 3, 5)
-        hit_text = font.render('HIT ME', True, 'black')
+        hit_text = render_text(font, 'HIT ME', 'black')
         screen.blit(hit_text, (55, 735))
         button_list.append(hit_btn)
 
         stand_btn = pygame.draw.rect(screen, 'white', [300, 700, 300, 100], 0, 5)
         pygame.draw.rect(screen, 'green', [300, 700, 300, 100], 3, 5)
-        stand_text = font.render('STAND', True, 'black')
+        stand_text = render_text(font, 'STAND', 'black')
         screen.blit(stand_text, (355, 735))
         button_list.append(stand_btn)
 
         # Draw scoreboard at the bottom
-        score_text = smaller_font.render(
-            f'Wins: {record[0]}   Losses: {record[1]}   Draws: {record[2]}', True, 'white'
+        score_text = render_text(
+            smaller_font, f'Wins: {record[0]}   Losses: {record[1]}   Draws: {record[2]}', 'white'
         )
         screen.blit(score_text, (15, 840))
 
     # If we have an outcome, show result message and NEW HAND button
     if result != 0:
-        res_text = font.render(results[result], True, 'white')
+        res_text = render_text(font, results[result], 'white')
         screen.blit(res_text, (15, 25))
 
         new_hand_btn = pygame.draw.rect(screen, 'white', [150, 220, 300, 100], 0, 5)
         pygame.draw.rect(screen, 'green', [150, 220, 300, 100], 3, 5)
         pygame.draw.rect(screen, 'black', [153, 223, 294, 94], 3, 5)
 
-        nh_text = font.render('NEW HAND', True, 'black')
+        nh_text = render_text(font, 'NEW HAND', 'black')
         screen.blit(nh_text, (165, 250))
 
         button_list.append(new_hand_btn)
@@ -274,39 +255,37 @@ def check_endgame(hand_act, d_score, p_score, result, totals, add):
 
 
 # ---------------------- MAIN GAME LOOP ----------------------
-run = True
-game_deck = []
+# Event driven: sleep until input arrives, handle it, run one logic step that
+# resolves everything not waiting on the player, then draw one frame.
 
-while run:
-    clock.tick(fps)
-    # Fill background
+def draw_frame():
+    """
+    Draws the whole table for the current state and shows it.
+    Returns the button rects, for the next round of event handling.
+    """
+    frame_timer.start()
     screen.fill('black')
-
-    # If we need an initial deal => give 2 cards to player and 2 to dealer
-    if initial_deal:
-        for _ in range(2):
-            my_hand, game_deck = deal_cards(my_hand, game_deck)
-            dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
-        initial_deal = False
-
-    # If active => draw & update
     if active:
-        player_score = calculate_score(my_hand)
         draw_cards(my_hand, dealer_hand, reveal_dealer)
+        draw_scores(player_score, dealer_score)
+    button_list = draw_game_ui(active, records, outcome)
+    frame_timer.stop()
+    pygame.display.flip()
+    return button_list
 
-        if reveal_dealer:
-            dealer_score = calculate_score(dealer_hand)
-            # Dealer draws until 17+
-            if dealer_score < 17:
-                dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
 
-        draw_scores(player_score, dealer_score)
+run = True
+# Time spent drawing each frame, reported on exit with BLACKJACK_DEBUG=1
+frame_timer = FrameTimer()
+# Mouse movement never changes anything, so it shouldn't wake the loop up
+pygame.event.set_blocked(pygame.MOUSEMOTION)
+buttons = draw_frame()
 
-    # Draw UI (buttons, etc.)
-    buttons = draw_game_ui(active, records, outcome)
+while run:
+    events = [pygame.event.wait()] + pygame.event.get()
 
     # Event handling
-    for event in pygame.event.get():
+    for event in events:
         if event.type == pygame.QUIT:
             run = False
 
@@ -325,8 +304,9 @@ while run:
                     # Start a new round
                     active = True
                     initial_deal = True
-                    # Generate a fresh deck
-                    game_deck = copy.deepcopy(base_deck * decks)
+                    # Reshuffle the shoe in place if the cut card came out
+                    if game_deck.needs_shuffle():
+                        game_deck.shuffle()
                     my_hand = []
                     dealer_hand = []
                     outcome = 0
@@ -351,7 +331,8 @@ while run:
                 if len(buttons) == 3 and buttons[2].collidepoint(event.pos):
                     active = True
                     initial_deal = True
-                    game_deck = copy.deepcopy(base_deck * decks)
+                    if game_deck.needs_shuffle():
+                        game_deck.shuffle()
                     my_hand = []
                     dealer_hand = []
                     outcome = 0
@@ -361,14 +342,35 @@ while run:
                     dealer_score = 0
                     player_score = 0
 
-    # If player is still hitting and goes >= 21 => stop
-    if hand_active and player_score >= 21:
-        hand_active = False
-        reveal_dealer = True
+    # ---------------------- LOGIC STEP ----------------------
+    # If we need an initial deal => give 2 cards to player and 2 to dealer
+    if initial_deal:
+        for _ in range(2):
+            my_hand, game_deck = deal_cards(my_hand, game_deck)
+            dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
+        initial_deal = False
+
+    if active:
+        player_score = player_scorer(my_hand)
+
+        # If player is still hitting and goes >= 21 => stop
+        if hand_active and player_score >= 21:
+            hand_active = False
+            reveal_dealer = True
+
+        # Dealer draws until 17+, all in this step rather than one card per frame
+        if reveal_dealer:
+            dealer_score = dealer_scorer(dealer_hand)
+            while dealer_score < 17:
+                dealer_hand, game_deck = deal_cards(dealer_hand, game_deck)
+                dealer_score = dealer_scorer(dealer_hand)
 
     # Check if the dealer is done => see who won
     outcome, records, add_score = check_endgame(hand_active, dealer_score, player_score, outcome, records, add_score)
 
-    pygame.display.flip()
+    buttons = draw_frame()
 
+if DEBUG:
+    print(frame_timer.report())
+    print(f"text cache: {text_cache.hits} hits, {text_cache.misses} misses")
 pygame.quit()
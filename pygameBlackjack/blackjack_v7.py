@@ -1,108 +1,29 @@
 import tkinter as tk
-import random
 import json
-from tkinter import messagebox
-from PIL import Image, ImageTk
 from typing import Optional
 
+from card_atlas import cached_atlas_path
+from card_images import CardPreloader, card_images
+from cards import BACK, CARD_VALUES, FULL_DECK, MAX_CARDS
+from debug import DEBUG
+from hints import Hint, HintWorker
+from table_canvas import TableCanvas
+from table_engine import Player, TableEngine
+from toasts import ToastManager
 
-class Player:
-    """
-    Represents a single participant in the game (including bots and dealer).
-    Stores name, card values, and references to Label widgets for the UI.
-    """
-    def __init__(self, name: str, is_bot=False, is_dealer=False):
-        self.name = name
-        self.is_bot = is_bot
-        self.is_dealer = is_dealer
-
-        # List of integer card values, e.g. [10, 11, 4]
-        self.cards_values = []
-        # Index (0..4) of the next card slot
-        self.spot = 0
-
-        # Tkinter Label widgets that display the card images
-        self.card_labels = []
-
-        # Real card images (for later "reveal"), especially for bots
-        self.real_card_images = [None]*5
-
-    def reset(self):
-        """Resets the player's state (called at the start of a new round)."""
-        self.cards_values.clear()
-        self.spot = 0
-        self.real_card_images = [None]*5
-
-    def add_card_value(self, value: int) -> bool:
-        """
-        Adds 'value' (the card's point value) to the player's card list.
-        Returns True if the card was successfully added, or False if there's no space.
-        """
-        if self.spot >= 5:
-            return False
-        self.cards_values.append(value)
-        self.spot += 1
-        return True
-
-    def calculate_total(self) -> int:
-        """Returns the sum of the card values (without converting Aces to 1)."""
-        return sum(self.cards_values)
-
-    def convert_aces_if_needed(self):
-        """
-        If the player is bust (> 21) and has Aces counted as 11,
-        convert them to 1 until there's no bust or no more Aces.
-        """
-        while self.calculate_total() > 21 and 11 in self.cards_values:
-            idx = self.cards_values.index(11)
-            self.cards_values[idx] = 1
-
-    def is_bust(self) -> bool:
-        """Returns True if the player's total exceeds 21 (bust)."""
-        return self.calculate_total() > 21
-
-    def bot_decision(self, dealer_upcard: Optional[int]) -> bool:
-        """
-        Bot AI logic:
-          1) If total < 12, always hit.
-          2) If total >= 19, stand.
-          3) For totals in [12..18], hit with a certain probability:
-             if dealer_upcard <= 6 => 30% chance; else => 60%.
-        Returns True if the bot wants to hit, False if it stands.
-        """
-        self.convert_aces_if_needed()
-        total = self.calculate_total()
-
-        if len(self.cards_values) >= 5 or self.is_bust():
-            return False
-
-        # If the dealer upcard is unknown, assume 7
-        if dealer_upcard is None:
-            dealer_upcard = 7
-
-        if total < 12:
-            return True
-        elif total >= 19:
-            return False
-        else:
-            # total in [12..18]
-            if dealer_upcard <= 6:
-                chance_to_hit = 0.3
-            else:
-                chance_to_hit = 0.6
-            return (random.random() < chance_to_hit)
+# Point value -> the first card id with that value, for saves that only kept values
+_CARD_FOR_VALUE = {CARD_VALUES[card]: card for card in reversed(FULL_DECK)}
 
 
 class Game:
     """
-    Manages the Blackjack game logic and Tkinter UI in an OOP style.
+    Tkinter view of a TableEngine: draws the engine's events and forwards button clicks.
     """
 
-    def __init__(self):
-        # Global scores
-        self.player_wins = 0
-        self.dealer_wins = 0
-        self.ties = 0
+    def __init__(self, engine: TableEngine = None, result_timeout_ms: Optional[int] = None,
+                 debug: bool = False):
+        # The rules live in the engine; the Game only renders them
+        self.engine = engine if engine is not None else TableEngine()
 
         # Tkinter window
         self.root = tk.Tk()
@@ -110,26 +31,56 @@ class Game:
         self.root.configure(bg="#0B3B0B")
         self.root.geometry("1120x630")
 
-        # Deck and hidden images
-        self.deck = []
-        self.dealer_hidden_card_img = None
-
-        # Create participants
-        self.dealer = Player("Dealer", is_dealer=True)
-        self.player = Player("Player")
-        self.bot1 = Player("Bot1", is_bot=True)
-        self.bot2 = Player("Bot2", is_bot=True)
+        # Participants are owned by the engine
+        self.dealer = self.engine.dealer
+        self.player = self.engine.player
+        self.bot1 = self.engine.bot1
+        self.bot2 = self.engine.bot2
+        self.players = self.engine.players
+
+        # Warm start: crop every card from the cached atlas (one file, one decode).
+        # Cold start: decode and resize every card in the background; card
+        # updates wait in the UI queue until their images have arrived, so the
+        # Tk thread never decodes a PNG. The preloader then writes the atlas.
+        self.preloader = CardPreloader(self.root, size=(126,182))
+        atlas_file = cached_atlas_path((126,182))
+        if atlas_file is not None:
+            card_images.set_atlas((126,182), tk.PhotoImage(file=atlas_file))
+        else:
+            self.preloader.start()
+
+        # Tk updates queued during a logic step, applied by one after_idle callback.
+        # Keyed so that e.g. eight title changes while dealing become one.
+        self._pending_ui = {}
+        self._flush_id = None
+        # Card slots among the queued updates -> asset they will show
+        self._queued_cards = {}
+        # Instrumentation: queued UI updates actually applied, per round and
+        # overall (one update may make several Tk calls, e.g. both buttons)
+        self.ui_updates = 0
+        self.last_round_ui_updates = 0
+        self.total_ui_updates = 0
+        self.rounds_drawn = 0
+        self.flushes = 0
+        # False until the first round starts (setup updates aren't a round)
+        self.round_drawn = False
 
-        self.players = [self.dealer, self.bot1, self.player, self.bot2]
+        # Build the UI
+        self.debug = debug
+        self.setup_ui()
 
-        # Track blackjack/bust status for dealer/player only
-        self.blackjack_status = {"dealer": "no", "player": "no"}
+        # Hit/stand EVs for the player's hand, solved on a worker thread
+        self.hints = HintWorker(self.root, self.on_hint)
 
-        # Image for the back of a card
-        self.back_img = self.resize_card("images/cards/back.png", (126,182))
+        # Round results are shown in-window and never block the event loop;
+        # with a timeout they also go away on their own
+        self.toasts = ToastManager(self.root, timeout_ms=result_timeout_ms)
 
-        # Build the UI
-        self.setup_ui()
+        self.engine.subscribe("round_start", self.on_round_start)
+        self.engine.subscribe("card", self.on_card)
+        self.engine.subscribe("deck_empty", self.on_deck_empty)
+        self.engine.subscribe("summary", self.show_aggregate_result)
+        self.engine.subscribe("result", self.show_result_and_disable_buttons)
 
         # Deal initial cards
         self.shuffle_deck()
@@ -145,9 +96,11 @@ class Game:
         Minimal JSON save example. It serializes global scores and each player's cards.
         """
         state = {
-            "player_wins": self.player_wins,
-            "dealer_wins": self.dealer_wins,
-            "ties": self.ties,
+            "player_wins": self.engine.player_wins,
+            "dealer_wins": self.engine.dealer_wins,
+            "ties": self.engine.ties,
+            "round_over": self.engine.round_over,
+            "outcome": self.engine.outcome,
             "players": []
         }
         for p in self.players:
@@ -155,7 +108,7 @@ class Game:
                 "name": p.name,
                 "is_bot": p.is_bot,
                 "is_dealer": p.is_dealer,
-                "cards_values": p.cards_values
+                "cards": p.cards
             }
             state["players"].append(data_p)
 
@@ -168,128 +121,151 @@ class Game:
             state = json.load(f)
 
         new_game = cls()
-        new_game.player_wins = state["player_wins"]
-        new_game.dealer_wins = state["dealer_wins"]
-        new_game.ties = state["ties"]
-
+        new_game.engine.player_wins = state["player_wins"]
+        new_game.engine.dealer_wins = state["dealer_wins"]
+        new_game.engine.ties = state["ties"]
+
+        # Rebuild each hand from its card ids and redraw the seats to match,
+        # in place of the fresh deal that is still queued
+        new_game.drop_queued_cards()
+        new_game.queue_ui("clear", new_game.table.clear_cards)
         for i, pdata in enumerate(state["players"]):
-            new_game.players[i].cards_values = pdata["cards_values"]
+            person = new_game.players[i]
+            if "cards" in pdata:
+                person.set_cards(pdata["cards"])
+            else:
+                # Older saves only kept point values; show one card of each value
+                person.set_cards(_CARD_FOR_VALUE[value] for value in pdata["cards_values"])
+            seat = new_game.seats[person]
+            for idx, card in enumerate(person.cards):
+                new_game.queue_card(seat, idx, new_game.dealt_card_asset(person, idx, card))
+
+        # The status of the random deal made by cls() doesn't apply to the loaded hands
+        new_game.engine.restore_round(state.get("round_over"), state.get("outcome"))
+        if new_game.engine.round_over:
+            new_game.reveal_dealer_hidden_card()
+            new_game.queue_ui("buttons", new_game.set_buttons_state, "disabled")
+        else:
+            new_game.queue_ui("buttons", new_game.set_buttons_state, "normal")
+            new_game.request_hint()
 
+        new_game.update_player_score_label()
+        new_game.update_scoreboard_label()
         return new_game
 
     def finish_game(self):
         """Close the app if needed."""
+        self.preloader.stop()
+        self.hints.stop()
         self.root.quit()
 
     def win_condition(self):
-        pass
+        """True once the round is over and the player won it."""
+        return self.engine.round_over and self.engine.outcome == "player"
 
     def lose_condition(self):
-        pass
+        """True once the round is over and the dealer won it."""
+        return self.engine.round_over and self.engine.outcome == "dealer"
 
-    def step(self):
-        pass
+    def step(self, action):
+        """
+        Agent API for this table (table_env.VecTableEnv does the same for N tables):
+        a true 'action' hits, a false one stands; hitting on five cards stands.
+        Returns (state, reward, done) with reward +1/-1/0 once the round is over.
+        """
+        if not self.engine.round_over:
+            if action and self.player.spot < MAX_CARDS:
+                self.player_hit()
+            else:
+                self.stand()
+        reward = 1 if self.win_condition() else -1 if self.lose_condition() else 0
+        return self.get_current_state(), reward, self.engine.round_over
 
     def get_current_state(self):
-        return {
-            "player_wins": self.player_wins,
-            "dealer_wins": self.dealer_wins,
-            "ties": self.ties,
-            "dealer_cards": self.dealer.cards_values,
-            "player_cards": self.player.cards_values,
-            "bot1_cards": self.bot1.cards_values,
-            "bot2_cards": self.bot2.cards_values
-        }
+        return self.engine.get_current_state()
 
     def run(self):
         self.root.mainloop()
 
-    # ---------------------- UI and game logic ----------------------
-    def setup_ui(self):
+    def ui_report(self) -> str:
+        avg = self.total_ui_updates / self.rounds_drawn if self.rounds_drawn else 0.0
+        return (f"{self.rounds_drawn} rounds drawn, {avg:.1f} UI updates per round on average "
+                f"(last round: {self.last_round_ui_updates}), {self.flushes} flushes")
+
+    # ---------------------- batched UI updates ----------------------
+    def queue_ui(self, key, fn, *args, **kwargs):
         """
-        Sets up all the Tk widgets: frames for dealer, bots, player, buttons, scoreboard, etc.
+        Queues fn(*args) instead of calling Tk right away. A later update with
+        the same key replaces the queued one, so only the final title, score or
+        card image of a logic step is drawn. Everything queued is applied by a
+        single after_idle callback, i.e. once per user action.
         """
-        # Dealer frame
-        dealer_frame = tk.LabelFrame(
-            self.root,
-            text="Dealer",
-            bg="#0B3B0B",
-            fg="white",
-            bd=2,
-            font=("Verdana", 17, "bold"),
-            labelanchor="n"
-        )
-        dealer_frame.pack(pady=14)
-
-        for i in range(5):
-            lbl = tk.Label(dealer_frame, text="", bg="#0B3B0B")
-            lbl.grid(row=0, column=i, padx=7, pady=7)
-            self.dealer.card_labels.append(lbl)
-
-        # Middle area: Bot1, Player, Bot2
-        middle_frame = tk.Frame(self.root, bg="#0B3B0B")
-        middle_frame.pack()
-
-        # Bot1
-        bot1_frame = tk.LabelFrame(
-            middle_frame,
-            text="Bot1",
-            bg="#0B3B0B",
-            fg="white",
-            bd=2,
-            font=("Verdana", 17, "bold"),
-            labelanchor="n"
-        )
-        bot1_frame.grid(row=0, column=0, padx=28, pady=14)
-
-        for i in range(5):
-            lbl = tk.Label(bot1_frame, text="", bg="#0B3B0B")
-            lbl.grid(row=0, column=i, padx=7, pady=7)
-            self.bot1.card_labels.append(lbl)
+        self._pending_ui[key] = (fn, args, kwargs)
+        if self._flush_id is None:
+            self._flush_id = self.root.after_idle(self.flush_ui)
+
+    def queue_card(self, seat, idx: int, asset: int):
+        """Queues card slot 'idx' of 'seat' to show 'asset' (a card id or cards.BACK)."""
+        key = (seat, idx)
+        self._queued_cards[key] = asset
+        if self.preloader.pending(asset):
+            self.preloader.request(asset)
+        self.queue_ui(key, self.show_card, seat, idx, asset)
+
+    def show_card(self, seat, idx: int, asset: int):
+        self.table.set_card(seat, idx, self.card_image(asset, (126,182)))
+
+    def drop_queued_cards(self):
+        """Forgets queued card updates, e.g. when the table is about to be cleared anyway."""
+        for key in self._queued_cards:
+            self._pending_ui.pop(key, None)
+        self._queued_cards.clear()
+
+    def flush_ui(self):
+        """Applies every queued update (normally called by Tk when idle)."""
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        # On a cold start, hold the frame until the preloader has the card images
+        if any(self.preloader.pending(asset) for asset in self._queued_cards.values()):
+            self._flush_id = self.root.after(self.preloader.poll_ms, self.flush_ui)
+            return
+        self._queued_cards.clear()
+        pending, self._pending_ui = self._pending_ui, {}
+        for fn, args, kwargs in pending.values():
+            fn(*args, **kwargs)
+        self.ui_updates += len(pending)
+        self.flushes += 1
 
-        # Player
-        player_frame = tk.LabelFrame(
-            middle_frame,
-            text="Player",
-            bg="#0B3B0B",
-            fg="white",
-            bd=2,
-            font=("Verdana", 17, "bold"),
-            labelanchor="n"
-        )
-        player_frame.grid(row=0, column=1, padx=28, pady=14)
+    def set_buttons_state(self, state: str):
+        card_button.config(state=state)
+        stand_button.config(state=state)
 
-        for i in range(5):
-            lbl = tk.Label(player_frame, text="", bg="#0B3B0B")
-            lbl.grid(row=0, column=i, padx=7, pady=7)
-            self.player.card_labels.append(lbl)
+    # ---------------------- UI and game logic ----------------------
+    def setup_ui(self):
+        """
+        Sets up the table canvas (dealer, bots, player, score), the buttons and the scoreboard.
+        """
+        # The whole table (seats, cards, player score) is drawn on one canvas
+        self.table = TableCanvas(self.root, width=1120, height=490, card_size=(126,182))
+        self.table.pack(pady=(14, 0))
+
+        # Dealer on top, then Bot1, Player, Bot2
+        self.seats = {
+            self.dealer: self.table.add_seat("Dealer", 560, 14),
+            self.bot1: self.table.add_seat("Bot1", 187, 250),
+            self.player: self.table.add_seat("Player", 560, 250),
+            self.bot2: self.table.add_seat("Bot2", 933, 250),
+        }
 
         global player_score_label
-        player_score_label = tk.Label(
-            player_frame,
-            text="Player Score: 0",
-            bg="#0B3B0B",
-            fg="white",
-            font=("Verdana", 14, "bold")
-        )
-        player_score_label.grid(row=1, column=0, columnspan=5, pady=7)
-
-        # Bot2
-        bot2_frame = tk.LabelFrame(
-            middle_frame,
-            text="Bot2",
-            bg="#0B3B0B",
-            fg="white",
-            bd=2,
-            font=("Verdana", 17, "bold"),
-            labelanchor="n"
-        )
-        bot2_frame.grid(row=0, column=2, padx=28, pady=14)
+        player_score_label = self.table.add_text(560, 476, "Player Score: 0")
 
-        for i in range(5):
-            lbl = tk.Label(bot2_frame, text="", bg="#0B3B0B")
-            lbl.grid(row=0, column=i, padx=7, pady=7)
-            self.bot2.card_labels.append(lbl)
+        # Hint panel left of the dealer, and the debug overlay (F3) under it
+        self.hint_text = self.table.add_text(190, 110, "", font=("Verdana", 13, "bold"))
+        self.debug_text = self.table.add_text(190, 200, "", font=("Verdana", 9), fill="#9FBF9F")
+        self.table.set_visible(self.debug_text, self.debug)
+        self.root.bind("<F3>", self.toggle_debug)
 
         # Buttons
         button_frame = tk.Frame(self.root, bg="#0B3B0B")
@@ -338,283 +314,115 @@ class Game:
         scoreboard_label.place(relx=0.98, rely=0.02, anchor="ne")
         self.update_scoreboard_label()
 
-    def resize_card(self, card_path, size=(126,182)):
-        img = Image.open(card_path)
-        img = img.resize(size)
-        return ImageTk.PhotoImage(img)
+    def card_image(self, asset, size=(126,182)):
+        """Returns the (cached) image of a card id, or of cards.BACK, at 'size'."""
+        return card_images.get(asset, size)
 
     def update_player_score_label(self):
         """Updates the player's score label with the current total."""
-        player_score_label.config(text=f"Player Score: {self.player.calculate_total()}")
+        self.queue_ui("score", self.table.set_text, player_score_label,
+                      f"Player Score: {self.player.calculate_total()}")
 
-    def shuffle_deck(self):
+    def toggle_debug(self, event=None):
+        self.debug = not self.debug
+        self.queue_ui("debug_visible", self.table.set_visible, self.debug_text, self.debug)
+
+    def unseen_counts(self):
         """
-        Creates and shuffles a new deck, resets all players, and deals initial cards.
+        Cards the player can't see, as ten counts in CountShoe order: the
+        rest of the shoe, the dealer's hole card and the bots' face-down cards.
         """
-        suits = ["diamonds", "clubs", "hearts", "spades"]
-        values = range(2, 15)
-        self.deck = [f"{v}_of_{s}" for s in suits for v in values]
-        random.shuffle(self.deck)
-
-        self.dealer.reset()
-        self.player.reset()
-        self.bot1.reset()
-        self.bot2.reset()
-        self.blackjack_status = {"dealer": "no", "player": "no"}
-        self.dealer_hidden_card_img = None
-
-        for p in self.players:
-            for lbl in p.card_labels:
-                lbl.config(image="", text="")
-
-        player_score_label.config(text="Player Score: 0")
-
-        self.deal_card_to(self.dealer)
-        self.deal_card_to(self.dealer)
-        self.deal_card_to(self.player)
-        self.deal_card_to(self.player)
-        self.deal_card_to(self.bot1)
-        self.deal_card_to(self.bot1)
-        self.deal_card_to(self.bot2)
-        self.deal_card_to(self.bot2)
-
-        card_button.config(state="normal")
-        stand_button.config(state="normal")
-
-        self.root.title(f"Cards left: {len(self.deck)}")
-
-    def deal_card_to(self, person: Player):
-        """Deals one card to the given 'person' (dealer/bot/player)."""
-        if len(self.deck) == 0:
-            self.root.title("No more cards in the deck!")
-            return
-
-        card_name = random.choice(self.deck)
-        self.deck.remove(card_name)
-        card_val = self.get_card_value(card_name)
-
-        if not person.add_card_value(card_val):
+        counts = [0] * 10
+        for card in self.engine.deck:
+            counts[CARD_VALUES[card] - 2] += 1
+        for card in self.dealer.cards[1:] + self.bot1.cards + self.bot2.cards:
+            counts[CARD_VALUES[card] - 2] += 1
+        return counts
+
+    def request_hint(self):
+        """Asks the worker for the EVs of the player's current hand (replacing any older request)."""
+        player = self.player
+        if self.engine.round_over or player.spot < 2 or player.best_total >= 21 or not self.dealer.cards_values:
             return
+        self.hints.request(player.best_total, player.is_soft(), player.spot,
+                           self.dealer.cards_values[0], self.unseen_counts())
+        self.queue_ui("hint", self.table.set_text, self.hint_text, "Thinking...")
+
+    def on_hint(self, hint: Hint):
+        """Called on the Tk thread once the worker has the EVs for the current hand."""
+        hit = "-" if hint.hit_ev is None else f"{hint.hit_ev:+.3f}"
+        self.queue_ui("hint", self.table.set_text, self.hint_text,
+                      f"Hit EV:   {hit}\nStand EV: {hint.stand_ev:+.3f}\nBest: {hint.best()}")
+        self.queue_ui("debug", self.table.set_text, self.debug_text,
+                      f"hint latency {hint.latency_ms:.1f} ms "
+                      f"(avg {self.hints.average_latency_ms():.1f} ms, "
+                      f"{self.hints.delivered} shown, {self.hints.cancelled} cancelled)")
+
+    def clear_hint(self):
+        self.hints.cancel()
+        self.queue_ui("hint", self.table.set_text, self.hint_text, "")
 
-        real_card_img = self.resize_card(f"images/cards/{card_name}.png", (126,182))
-
-        # Store the real image in case we want to reveal it later
-        idx = person.spot - 1
-        person.real_card_images[idx] = real_card_img
-
-        # --- Dealer logic ---
-        if person.is_dealer and person.spot == 2:
-            # Hide dealer's second card
-            self.dealer_hidden_card_img = real_card_img
-            lbl = person.card_labels[1]
-            lbl.config(image=self.back_img)
-            lbl.image = self.back_img
-
-        # --- Bots: all cards are hidden until the end ---
-        elif person.is_bot:
-            lbl = person.card_labels[idx]
-            lbl.config(image=self.back_img)
-            lbl.image = self.back_img
-
-        else:
-            # Player (or dealer's other cards)
-            lbl = person.card_labels[idx]
-            lbl.config(image=real_card_img)
-            lbl.image = real_card_img
-
-        # If it's the player, check for 21/bust and update the score label
-        if person == self.player:
-            self.check_blackjack_or_bust("player")
-            self.update_player_score_label()
-        elif person.is_dealer:
-            self.check_blackjack_or_bust("dealer")
-
-        self.root.title(f"Cards left: {len(self.deck)}")
-
-    def get_card_value(self, card_name: str) -> int:
-        value = int(card_name.split("_", 1)[0])
-        if value == 14:
-            return 11  # Ace
-        elif value in [11, 12, 13]:
-            return 10  # J, Q, K
-        else:
-            return value
-
-    def check_blackjack_or_bust(self, player_type: str):
-        """
-        Checks whether 'player' or 'dealer' reached 21 or bust,
-        then calls check_immediate_outcomes() if needed.
-        """
-        if player_type == "player":
-            self.player.convert_aces_if_needed()
-            total = self.player.calculate_total()
-            if total == 21:
-                self.blackjack_status["player"] = "yes"
-            elif total > 21:
-                self.blackjack_status["player"] = "bust"
-            self.check_immediate_outcomes()
-
-        elif player_type == "dealer":
-            self.dealer.convert_aces_if_needed()
-            total = self.dealer.calculate_total()
-            if total == 21:
-                self.blackjack_status["dealer"] = "yes"
-            elif total > 21:
-                self.blackjack_status["dealer"] = "bust"
-            self.check_immediate_outcomes()
-
-    def check_immediate_outcomes(self):
-        p_status = self.blackjack_status["player"]
-        d_status = self.blackjack_status["dealer"]
-        p_total = self.player.calculate_total()
-        d_total = self.dealer.calculate_total()
-
-        if d_status == "yes" and p_status == "yes":
-            self.show_result_and_disable_buttons(
-                "Push!",
-                "It's a tie! Both have 21.",
-                outcome="tie"
-            )
-        elif d_status == "yes":
-            self.show_result_and_disable_buttons(
-                "Dealer Wins!",
-                "Dealer got 21!",
-                outcome="dealer"
-            )
-        elif p_status == "yes":
-            self.show_result_and_disable_buttons(
-                "Player Wins!",
-                "Player got 21!",
-                outcome="player"
-            )
-        elif p_status == "bust":
-            self.show_result_and_disable_buttons(
-                "Player Bust!",
-                f"Player is over 21! Total: {p_total}",
-                outcome="dealer"
-            )
+    def shuffle_deck(self):
+        """'Shuffle Deck' => start a new round in the engine."""
+        self.engine.shuffle_deck()
 
     def player_hit(self):
         """Button 'Hit Me!' => give a card to the player."""
-        self.deal_card_to(self.player)
+        self.engine.player_hit()
 
     def stand(self):
         """
         When the player clicks 'Stand':
           - Disable 'Hit' and 'Stand'
-          - Bots take their turns
-          - Dealer takes cards until total >= 17
-          - Compare results and show the outcome
+          - The engine plays the bots and the dealer and settles the round
         """
-        card_button.config(state="disabled")
-        stand_button.config(state="disabled")
+        self.queue_ui("buttons", self.set_buttons_state, "disabled")
+        self.engine.stand()
+
+    # ---------------------- engine event handlers ----------------------
+    def on_round_start(self):
+        """Clears the table for a new round."""
+        # Whatever the last round still had queued goes out first (and is
+        # counted for that round), so nothing stale lands after the clear.
+        # Its cards are about to be hidden, so they aren't waited for.
+        self.drop_queued_cards()
+        if self._pending_ui:
+            self.flush_ui()
+        if self.round_drawn:
+            self.last_round_ui_updates = self.ui_updates
+            self.total_ui_updates += self.ui_updates
+            self.rounds_drawn += 1
+        self.ui_updates = 0
+        self.round_drawn = True
+
+        self.clear_hint()
+        self.queue_ui("toasts", self.toasts.clear)
+        self.queue_ui("clear", self.table.clear_cards)
+        self.queue_ui("score", self.table.set_text, player_score_label, "Player Score: 0")
+        self.queue_ui("buttons", self.set_buttons_state, "normal")
+
+    def on_card(self, person: Player, card: int):
+        """Shows the card the engine just dealt to 'person'."""
+        idx = person.spot - 1
+        seat = self.seats[person]
+        self.queue_card(seat, idx, self.dealt_card_asset(person, idx, card))
 
-        if self.blackjack_status["player"] in ["bust", "yes"]:
-            return
-        if self.blackjack_status["dealer"] == "yes":
-            return
+        if person is self.player:
+            self.update_player_score_label()
+            self.request_hint()
 
-        self.play_for_bot(self.bot1)
-        self.play_for_bot(self.bot2)
+        self.queue_ui("title", self.root.title, f"Cards left: {len(self.engine.deck)}")
 
-        while True:
-            self.dealer.convert_aces_if_needed()
-            if self.dealer.calculate_total() < 17 and self.dealer.spot < 5:
-                self.deal_card_to(self.dealer)
-            else:
-                break
-
-        self.final_comparison()
-
-    def play_for_bot(self, bot: Player):
-        """Bot's logic: repeat while the bot decides to hit."""
-        while True:
-            bot.convert_aces_if_needed()
-            if bot.is_bust() or len(bot.cards_values) >= 5:
-                break
-            dealer_upcard = None
-            if len(self.dealer.cards_values) > 0:
-                dealer_upcard = self.dealer.cards_values[0]
-
-            if bot.bot_decision(dealer_upcard):
-                self.deal_card_to(bot)
-            else:
-                break
+    def dealt_card_asset(self, person: Player, idx: int, card: int) -> int:
+        """What card slot 'idx' of 'person' shows while the round is being played."""
+        # Dealer's second card and all bot cards stay hidden until the end
+        if (person.is_dealer and idx == 1) or person.is_bot:
+            return BACK
+        # Player (or dealer's other cards)
+        return card
 
-    def final_comparison(self):
-        """
-        Compare player's and dealer's totals, also compare each bot to the dealer.
-        Then reveal all hidden cards from bots (and dealer's second card).
-        """
-        # Reveal bots' cards
-        self.reveal_bot_cards(self.bot1)
-        self.reveal_bot_cards(self.bot2)
-
-        self.dealer.convert_aces_if_needed()
-        d_total = self.dealer.calculate_total()
-        dealer_bust = (d_total > 21)
-
-        self.player.convert_aces_if_needed()
-        p_total = self.player.calculate_total()
-        player_bust = (p_total > 21)
-
-        bot1_result = self.compare_with_dealer(self.bot1)
-        bot2_result = self.compare_with_dealer(self.bot2)
-
-        if dealer_bust:
-            self.show_aggregate_result(
-                dealer_total=d_total,
-                player_total=p_total,
-                player_outcome="Win (Dealer Bust)",
-                bot1_result="Win (Dealer Bust)",
-                bot2_result="Win (Dealer Bust)"
-            )
-            self.show_result_and_disable_buttons(
-                "Player Wins!",
-                f"Dealer busted! Player total: {p_total}",
-                outcome="player"
-            )
-        else:
-            if player_bust:
-                player_outcome = "Bust"
-                outcome_for_stats = "dealer"
-            else:
-                if p_total > d_total:
-                    player_outcome = "Win"
-                    outcome_for_stats = "player"
-                elif p_total < d_total:
-                    player_outcome = "Lose"
-                    outcome_for_stats = "dealer"
-                else:
-                    player_outcome = "Tie"
-                    outcome_for_stats = "tie"
-
-            self.show_aggregate_result(
-                dealer_total=d_total,
-                player_total=p_total,
-                player_outcome=player_outcome,
-                bot1_result=bot1_result,
-                bot2_result=bot2_result
-            )
-
-            if outcome_for_stats == "player":
-                self.show_result_and_disable_buttons(
-                    "Player Wins!",
-                    f"Player: {p_total}, Dealer: {d_total}",
-                    outcome="player"
-                )
-            elif outcome_for_stats == "dealer":
-                self.show_result_and_disable_buttons(
-                    "Dealer Wins!",
-                    f"Dealer: {d_total}, Player: {p_total}",
-                    outcome="dealer"
-                )
-            else:
-                self.show_result_and_disable_buttons(
-                    "Push!",
-                    f"Tie! Dealer: {d_total}, Player: {p_total}",
-                    outcome="tie"
-                )
+    def on_deck_empty(self):
+        self.queue_ui("title", self.root.title, "No more cards in the deck!")
 
     def reveal_bot_cards(self, bot: Player):
         """
@@ -624,38 +432,17 @@ class Game:
         if not bot.is_bot:
             return
 
-        for i in range(bot.spot):
-            lbl = bot.card_labels[i]
-            real_img = bot.real_card_images[i]
-            if real_img is not None:
-                lbl.config(image=real_img)
-                lbl.image = real_img
-
-    def compare_with_dealer(self, bot: Player) -> str:
-        """
-        Returns the result for a bot: 'Bust', 'Win', 'Lose', or 'Tie'.
-        """
-        bot.convert_aces_if_needed()
-        b_total = bot.calculate_total()
-        if b_total > 21:
-            return "Bust"
-
-        self.dealer.convert_aces_if_needed()
-        d_total = self.dealer.calculate_total()
-        if d_total > 21:
-            return "Win (Dealer Bust)"
-
-        if b_total > d_total:
-            return "Win"
-        elif b_total < d_total:
-            return "Lose"
-        else:
-            return "Tie"
+        seat = self.seats[bot]
+        for i, card in enumerate(bot.cards):
+            self.queue_card(seat, i, card)
 
     def show_aggregate_result(self, dealer_total, player_total, player_outcome, bot1_result, bot2_result):
         """
-        Shows a messagebox with final results for dealer, player, and both bots.
+        Reveals the bots' cards and shows a toast with final results
+        for dealer, player, and both bots.
         """
+        self.reveal_bot_cards(self.bot1)
+        self.reveal_bot_cards(self.bot2)
         self.reveal_dealer_hidden_card()
         msg = (
             f"Dealer total: {dealer_total}\n"
@@ -663,40 +450,38 @@ class Game:
             f"Bot1 -> {bot1_result}\n"
             f"Bot2 -> {bot2_result}\n"
         )
-        messagebox.showinfo("Round Results", msg)
+        self.queue_ui(("toast", "Round Results"), self.toasts.show, "Round Results", msg)
 
     def reveal_dealer_hidden_card(self):
         """
         Shows the dealer's second card if it was previously hidden.
         """
-        if self.dealer.spot > 1 and self.dealer_hidden_card_img is not None:
-            self.dealer.card_labels[1].config(image=self.dealer_hidden_card_img)
+        if self.dealer.spot > 1:
+            seat = self.seats[self.dealer]
+            self.queue_card(seat, 1, self.dealer.cards[1])
 
     def update_scoreboard_label(self):
-        scoreboard_label.config(
-            text=f"Wins: {self.player_wins}  Losses: {self.dealer_wins}  Ties: {self.ties}"
+        self.queue_ui(
+            "scoreboard", scoreboard_label.config,
+            text=f"Wins: {self.engine.player_wins}  Losses: {self.engine.dealer_wins}  Ties: {self.engine.ties}"
         )
 
     def show_result_and_disable_buttons(self, title, text, outcome=None):
         """
-        Ends the round: displays a message, updates global stats if needed,
-        and disables Hit/Stand buttons.
+        Ends the round: displays a message, refreshes the scoreboard
+        (the engine already updated the stats) and disables Hit/Stand buttons.
         """
-        if outcome == "player":
-            self.player_wins += 1
-        elif outcome == "dealer":
-            self.dealer_wins += 1
-        elif outcome == "tie":
-            self.ties += 1
-
+        self.clear_hint()
         self.reveal_dealer_hidden_card()
         self.update_scoreboard_label()
 
-        messagebox.showinfo(title, text)
-        card_button.config(state="disabled")
-        stand_button.config(state="disabled")
+        self.queue_ui(("toast", title), self.toasts.show, title, text)
+        self.queue_ui("buttons", self.set_buttons_state, "disabled")
 
 
 if __name__ == '__main__':
-    game = Game()
+    # BLACKJACK_DEBUG=1 starts with the overlay on (F3 toggles it) and prints the UI report on exit
+    game = Game(debug=DEBUG)
     game.run()
+    if game.debug:
+        print(game.ui_report())
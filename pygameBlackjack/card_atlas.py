@@ -0,0 +1,113 @@
+"""
+Sprite atlas of every card face plus the card back, cached on disk per size.
+
+The atlas is one PNG holding the 53 assets already resized, laid out in a
+grid of ATLAS_COLUMNS columns in asset-id order (see cards.ASSET_PATHS).
+Its file name carries the target size and a key built from the source
+files' mtimes, so editing any card image produces a fresh atlas and a warm
+start is one file read and one decode instead of 53.
+
+    python card_atlas.py [width height]   # builds the atlas and reports cold/warm startup times
+"""
+import glob
+import hashlib
+import os
+
+from atomic_write import write_atomically
+from cards import ASSET_PATHS
+
+ATLAS_DIR = "images/atlas"
+ATLAS_COLUMNS = 13
+
+
+def atlas_rect(asset: int, size):
+    """(x, y, width, height) of 'asset' inside the atlas built for 'size'."""
+    w, h = size
+    row, col = divmod(asset, ATLAS_COLUMNS)
+    return col * w, row * h, w, h
+
+
+def atlas_key(size) -> str:
+    """Key of the atlas for 'size': changes whenever a source image or the size changes."""
+    digest = hashlib.sha1(f"{size[0]}x{size[1]}".encode())
+    for path in ASSET_PATHS:
+        digest.update(f"{path}:{os.stat(path).st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def atlas_path(size) -> str:
+    return os.path.join(ATLAS_DIR, f"cards_{size[0]}x{size[1]}_{atlas_key(size)}.png")
+
+
+def cached_atlas_path(size):
+    """Path of an up-to-date atlas for 'size', or None if it still has to be built."""
+    path = atlas_path(size)
+    return path if os.path.exists(path) else None
+
+
+def save_atlas(resized_images, size) -> str:
+    """
+    Packs already resized PIL images (asset id -> image) into the atlas for
+    'size' and writes it to disk, replacing older atlases of the same size.
+    """
+    from PIL import Image
+
+    w, h = size
+    rows = -(-len(ASSET_PATHS) // ATLAS_COLUMNS)
+    atlas = Image.new("RGBA", (ATLAS_COLUMNS * w, rows * h), (0, 0, 0, 0))
+    for asset in range(len(ASSET_PATHS)):
+        x, y, _, _ = atlas_rect(asset, size)
+        atlas.paste(resized_images[asset].convert("RGBA"), (x, y))
+
+    path = atlas_path(size)
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    for stale in glob.glob(os.path.join(ATLAS_DIR, f"cards_{w}x{h}_*.png")):
+        if stale != path:
+            os.remove(stale)
+    write_atomically(path, lambda tmp_path: atlas.save(tmp_path, format="PNG"))
+    return path
+
+
+def build_atlas(size) -> str:
+    """Decodes and resizes every asset, then saves the atlas for 'size'."""
+    from PIL import Image
+
+    resized = {}
+    for asset, path in enumerate(ASSET_PATHS):
+        with Image.open(path) as img:
+            resized[asset] = img.resize(tuple(size))
+    return save_atlas(resized, size)
+
+
+def ensure_atlas(size) -> str:
+    """Returns the path of an up-to-date atlas for 'size', building it if needed."""
+    return cached_atlas_path(size) or build_atlas(size)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from PIL import Image
+
+    size = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) > 2 else (126, 182)
+
+    start = time.perf_counter()
+    for path in ASSET_PATHS:
+        with Image.open(path) as img:
+            img.resize(size)
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    path = build_atlas(size)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with Image.open(ensure_atlas(size)) as img:
+        img.load()
+    warm = time.perf_counter() - start
+
+    print(f"atlas: {path}")
+    print(f"53 separate PNGs:           {separate * 1000:8.1f} ms")
+    print(f"cold start (build atlas):   {cold * 1000:8.1f} ms")
+    print(f"warm start (read atlas):    {warm * 1000:8.1f} ms")
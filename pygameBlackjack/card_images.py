@@ -0,0 +1,221 @@
+"""
+Process-wide cache of resized card images for the Tk versions.
+
+Resized PhotoImages are kept in a bounded LRU keyed by (asset id, size), so
+dealing a card that has been seen before does no disk I/O, decoding or
+resampling. The full-size decoded PNGs (500x726 RGBA, about 80 MB for all
+53) are dropped once resized, unless keep_sources=True asks for them to be
+kept for resizing the same card to other sizes.
+
+CardPreloader fills the cache from a worker thread at startup so the first
+deals don't decode PNGs on the Tk thread. When a sprite atlas for the size is
+registered (see card_atlas.py), misses are cropped from it instead.
+"""
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+from card_atlas import atlas_rect, save_atlas
+from cards import ASSET_PATHS
+
+
+class CardImageCache:
+    """
+    (asset id, size) -> ImageTk.PhotoImage, with an LRU bound on the resized images.
+    Asset ids are card ids 0..51 plus cards.BACK for the card back.
+    """
+
+    def __init__(self, maxsize: int = 2 * len(ASSET_PATHS), make_photo=ImageTk.PhotoImage,
+                 keep_sources: bool = False):
+        self.maxsize = maxsize
+        # Turns a resized PIL image into whatever the UI draws (a PhotoImage for Tk)
+        self.make_photo = make_photo
+        self.keep_sources = keep_sources
+        # Decoded source images, only filled with keep_sources=True
+        self._decoded = {}
+        self._resized = OrderedDict()
+        # size -> tk.PhotoImage of the whole atlas for that size
+        self._atlases = {}
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+
+    def decoded(self, asset: int) -> Image.Image:
+        """Returns the full-size PIL image, from disk unless keep_sources kept it."""
+        img = self._decoded.get(asset)
+        if img is None:
+            img = Image.open(ASSET_PATHS[asset])
+            img.load()
+            if self.keep_sources:
+                self._decoded[asset] = img
+            self.decodes += 1
+        return img
+
+    def get(self, asset: int, size=(126,182)) -> ImageTk.PhotoImage:
+        """Returns the PhotoImage for 'asset' at 'size', creating it on a miss."""
+        key = (asset, tuple(size))
+        photo = self._resized.get(key)
+        if photo is not None:
+            self._resized.move_to_end(key)
+            self.hits += 1
+            return photo
+
+        self.misses += 1
+        atlas = self._atlases.get(key[1])
+        if atlas is not None:
+            photo = self._crop(atlas, asset, key[1])
+        else:
+            photo = self.make_photo(self.decoded(asset).resize(key[1]))
+        self._resized[key] = photo
+        if len(self._resized) > self.maxsize:
+            self._resized.popitem(last=False)
+        return photo
+
+    def set_atlas(self, size, atlas: tk.PhotoImage):
+        """Registers the atlas built for 'size'; misses at that size are cropped from it."""
+        self._atlases[tuple(size)] = atlas
+
+    @staticmethod
+    def _crop(atlas: tk.PhotoImage, asset: int, size) -> tk.PhotoImage:
+        x, y, w, h = atlas_rect(asset, size)
+        photo = tk.PhotoImage(width=w, height=h)
+        photo.tk.call(photo, "copy", atlas, "-from", x, y, x + w, y + h)
+        return photo
+
+    def add(self, asset: int, size, resized: Image.Image):
+        """
+        Stores an image resized elsewhere (see CardPreloader). Must run on the Tk
+        thread, since that's where PhotoImages have to be created.
+        """
+        key = (asset, tuple(size))
+        if key in self._resized:
+            return
+        self._resized[key] = self.make_photo(resized)
+        if len(self._resized) > self.maxsize:
+            self._resized.popitem(last=False)
+
+    def __contains__(self, key):
+        asset, size = key
+        return (asset, tuple(size)) in self._resized
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "decodes": self.decodes,
+            "cached": len(self._resized),
+        }
+
+    def clear(self):
+        self._decoded.clear()
+        self._resized.clear()
+        self._atlases.clear()
+
+
+# Shared by every Game in the process
+card_images = CardImageCache()
+
+
+class CardPreloader:
+    """
+    Decodes and resizes every card asset in a worker thread.
+
+    PIL does the work off the Tk thread; finished images go through a queue
+    that the Tk thread drains every 'poll_ms' with root.after, turning them
+    into PhotoImages in 'cache'. request() moves assets to the front of the
+    worker's list, so the cards of the first deal arrive first; pending()
+    tells the view whether an image is still on its way and worth waiting for
+    rather than loading it synchronously with cache.get(). Once everything is
+    resized, the worker also writes the sprite atlas so the next startup can
+    skip this.
+    """
+
+    def __init__(self, root, cache: CardImageCache = card_images, size=(126,182),
+                 poll_ms: int = 15, per_poll: int = 8, write_atlas: bool = True):
+        self.root = root
+        self.cache = cache
+        self.size = tuple(size)
+        self.poll_ms = poll_ms
+        # PhotoImage creation is cheap but not free; don't stall a single tick
+        self.per_poll = per_poll
+        self.write_atlas = write_atlas
+        self.done = False
+        self._queue = queue.Queue()
+        # Assets asked for by the Tk thread, decoded before the rest
+        self._requested = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._work, name="card-preloader", daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    def stop(self):
+        self._stop.set()
+
+    def request(self, asset: int):
+        """Has the worker decode 'asset' next, unless it already has."""
+        self._requested.put(asset)
+
+    def pending(self, asset: int) -> bool:
+        """True while the worker is running and hasn't delivered 'asset' yet."""
+        return (self._thread is not None and not self.done and not self._stop.is_set()
+                and (asset, self.size) not in self.cache)
+
+    def _next_asset(self, remaining: dict) -> int:
+        while True:
+            try:
+                asset = self._requested.get_nowait()
+            except queue.Empty:
+                break
+            if asset in remaining:
+                del remaining[asset]
+                return asset
+        asset = next(iter(remaining))
+        del remaining[asset]
+        return asset
+
+    def _work(self):
+        all_resized = {}
+        # Insertion-ordered set of the assets still to do
+        remaining = dict.fromkeys(range(len(ASSET_PATHS)))
+        while remaining:
+            if self._stop.is_set():
+                break
+            asset = self._next_asset(remaining)
+            path = ASSET_PATHS[asset]
+            try:
+                decoded = Image.open(path)
+                decoded.load()
+                resized = decoded.resize(self.size)
+            except OSError as e:
+                print(f"Warning: could not preload {path}: {e}")
+                continue
+            all_resized[asset] = resized
+            self._queue.put((asset, resized))
+        # Sentinel: the worker has nothing more to hand over
+        self._queue.put(None)
+
+        if self.write_atlas and len(all_resized) == len(ASSET_PATHS):
+            try:
+                save_atlas(all_resized, self.size)
+            except OSError as e:
+                print(f"Warning: could not write the card atlas: {e}")
+
+    def _poll(self):
+        for _ in range(self.per_poll):
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.done = True
+                return
+            asset, resized = item
+            self.cache.add(asset, self.size, resized)
+        if not self._stop.is_set():
+            self.root.after(self.poll_ms, self._poll)
@@ -0,0 +1,42 @@
+"""
+Compact card encoding shared by the engine and the UIs.
+
+A card is a plain int 0..51: card = rank_index * 4 + suit_index, where
+rank_index 0..12 stands for ranks 2..14 (11=J, 12=Q, 13=K, 14=A) and
+suit_index follows SUITS. Everything the game needs about a card is a
+lookup in the tables below, so dealing and scoring never parse strings.
+Names like "14_of_spades" are only built when talking to the image assets.
+"""
+
+SUITS = ("diamonds", "clubs", "hearts", "spades")
+RANKS = tuple(range(2, 15))
+
+# Every card of one deck, in id order
+FULL_DECK = tuple(range(len(RANKS) * len(SUITS)))
+
+# card id -> rank (2..14)
+CARD_RANKS = tuple(RANKS[c // 4] for c in FULL_DECK)
+# card id -> suit name
+CARD_SUITS = tuple(SUITS[c % 4] for c in FULL_DECK)
+# card id -> blackjack value (Ace counts as 11, J/Q/K as 10)
+CARD_VALUES = tuple(11 if r == 14 else min(r, 10) for r in CARD_RANKS)
+# card id -> hard value (Ace counts as 1), for scoring.hand_score
+CARD_HARD_VALUES = tuple(1 if v == 11 else v for v in CARD_VALUES)
+# card id -> asset name, e.g. "14_of_spades"
+CARD_NAMES = tuple(f"{r}_of_{s}" for r, s in zip(CARD_RANKS, CARD_SUITS))
+# card id -> image path relative to pygameBlackjack/
+CARD_PATHS = tuple(f"images/cards/{name}.png" for name in CARD_NAMES)
+
+BACK_PATH = "images/cards/back.png"
+
+# Id used for the card back in image caches, right after the 52 faces
+BACK = len(FULL_DECK)
+# asset id (0..52) -> image path: every face plus the back
+ASSET_PATHS = CARD_PATHS + (BACK_PATH,)
+
+# Nobody holds more than five cards (Player.add_card_value refuses a sixth)
+MAX_CARDS = 5
+# Policy and strategy tables are indexed by best total and dealer upcard;
+# best totals can reach 30 (20 plus a ten) and upcards are 2..11
+TOTALS = 32
+UPCARDS = 12
@@ -0,0 +1,213 @@
+"""
+Card-counting bot for TableEngine.
+
+A CardCounter keeps the running count of a tag table (Hi-Lo by default;
+any ten tags in CountShoe value order can be plugged in) and the true
+count, the running count per deck still in the shoe. The tags are
+expanded once into a tuple indexed by card id, so counting a card costs
+one tuple lookup and two additions. The counter is fed by the engine's
+"card" event (every card leaving the shoe in deal_card_to) and cleared by
+its "shuffle" event.
+
+The bot only counts what a player at the table can see, as blackjack_v7
+shows it. The dealer's hole card is counted at the "result" event that
+ends every round. The other bot's cards are face down until the "summary"
+event of a showdown; in a round decided earlier they are never shown and
+only shrink the shoe.
+
+A CountingBot is a bot seat driven by that count:
+  - its bet grows with the true count (1 unit up to max_units),
+  - with Hi-Lo tags, a few hard totals switch between hit and stand at
+    count indices (DEVIATIONS) instead of following the solved strategy table.
+
+    python counting.py [rounds] [decks]   # compares a counting bot with a plain strategy bot
+"""
+import random
+from typing import Optional
+
+from cards import CARD_VALUES, FULL_DECK, MAX_CARDS
+from table_engine import Player, TableEngine
+
+# Tags per value 2..11 (Ace = 11), in CountShoe order
+HI_LO = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1)
+KO = (1, 1, 1, 1, 1, 1, 0, 0, -1, -1)
+OMEGA_II = (1, 1, 2, 2, 2, 1, 0, -1, -2, 0)
+TAG_TABLES = {"hi-lo": HI_LO, "ko": KO, "omega-ii": OMEGA_II}
+
+# Hi-Lo index plays for hit/stand: (hard total, dealer upcard) -> true count
+# at or above which the bot stands (below it, it hits)
+DEVIATIONS = {
+    (16, 10): 0,
+    (16, 9): 5,
+    (15, 10): 4,
+    (13, 2): -1,
+    (13, 3): -2,
+    (12, 2): 3,
+    (12, 3): 2,
+    (12, 4): 0,
+    (12, 5): -2,
+    (12, 6): -1,
+}
+
+
+class CardCounter:
+    def __init__(self, tags=HI_LO, decks: int = 1):
+        if len(tags) != 10:
+            raise ValueError(f"a tag table needs 10 tags (values 2..11), got {len(tags)}")
+        self.tags = tuple(tags)
+        # Tag of every card id, so count() is a single lookup
+        self.card_tags = tuple(self.tags[CARD_VALUES[card] - 2] for card in FULL_DECK)
+        self.shoe_size = len(FULL_DECK) * decks
+        self.running = 0
+        self.seen = 0
+
+    def reset(self):
+        """Called when the shoe is reshuffled."""
+        self.running = 0
+        self.seen = 0
+
+    def count(self, card: int):
+        self.running += self.card_tags[card]
+        self.seen += 1
+
+    def skip(self, n: int = 1):
+        """Cards that left the shoe without being shown: fewer cards left, no tags."""
+        self.seen += n
+
+    def decks_left(self) -> float:
+        # Never divide by less than half a deck
+        return max(self.shoe_size - self.seen, 26) / 52
+
+    def true_count(self) -> float:
+        return self.running / self.decks_left()
+
+
+class CountingBot(Player):
+    """
+    A bot that counts the cards it can see at its table and bets and plays by the count.
+    Use CountingBot.join(engine) to seat one in place of an engine's bot.
+    """
+
+    def __init__(self, name: str, tags=HI_LO, decks: int = 1, unit: int = 1, max_units: int = 8,
+                 deviations: Optional[dict] = None):
+        super().__init__(name, is_bot=True)
+        self.counter = CardCounter(tags, decks)
+        self.unit = unit
+        self.max_units = max_units
+        # The index numbers are Hi-Lo counts, meaningless with other tags
+        if deviations is None:
+            deviations = DEVIATIONS if tags is HI_LO else {}
+        self.deviations = deviations
+        self.engine = None
+        # Face-down cards dealt this round, counted once they are turned over
+        self.hole_card = []
+        self.other_bot_cards = []
+
+        # Betting results
+        self.bet = 0
+        self.bankroll = 0
+        self.wagered = 0
+        self.hands = 0
+
+    @classmethod
+    def join(cls, engine: TableEngine, seat: str = "bot2", **kwargs) -> 'CountingBot':
+        """Replaces engine.bot1 or engine.bot2 with a CountingBot and subscribes it to the engine."""
+        old = getattr(engine, seat)
+        bot = cls(old.name, decks=engine.deck.decks, **kwargs)
+        setattr(engine, seat, bot)
+        engine.players[engine.players.index(old)] = bot
+        bot.engine = engine
+        engine.subscribe("shuffle", bot.on_shuffle)
+        engine.subscribe("card", bot.on_card)
+        engine.subscribe("round_start", bot.on_round_start)
+        engine.subscribe("summary", bot.on_summary)
+        engine.subscribe("result", bot.on_result)
+        return bot
+
+    def on_shuffle(self):
+        self.counter.reset()
+        self.hole_card.clear()
+        self.other_bot_cards.clear()
+
+    def on_round_start(self):
+        # The other bot's cards from a round that ended before the showdown
+        self.counter.skip(len(self.hole_card) + len(self.other_bot_cards))
+        self.hole_card.clear()
+        self.other_bot_cards.clear()
+        self.place_bet()
+
+    def on_card(self, person: Player, card: int):
+        if person.is_dealer and person.spot == 2:
+            self.hole_card.append(card)
+        elif person.is_bot and person is not self:
+            self.other_bot_cards.append(card)
+        else:
+            self.counter.count(card)
+
+    def on_summary(self, dealer_total, player_total, player_outcome, bot1_result, bot2_result):
+        """The showdown turns the bots' cards over."""
+        for card in self.other_bot_cards:
+            self.counter.count(card)
+        self.other_bot_cards.clear()
+        self.settle_bet(dealer_total, player_total, player_outcome, bot1_result, bot2_result)
+
+    def on_result(self, title, text, outcome):
+        """Every round ends with a "result", which shows the dealer's hole card."""
+        for card in self.hole_card:
+            self.counter.count(card)
+        self.hole_card.clear()
+
+    def bet_units(self) -> int:
+        """1 unit at a true count below 1, then one more unit per point of count."""
+        true_count = self.counter.true_count()
+        if true_count < 1:
+            return 1
+        return min(self.max_units, int(true_count) + 1)
+
+    def place_bet(self):
+        self.bet = self.bet_units() * self.unit
+
+    def settle_bet(self, dealer_total, player_total, player_outcome, bot1_result, bot2_result):
+        """Rounds that end before the showdown return the bet, so only showdowns are settled."""
+        result = self.engine.compare_with_dealer(self)
+        if result.startswith("Win"):
+            self.bankroll += self.bet
+        elif result != "Tie":
+            self.bankroll -= self.bet
+        self.wagered += self.bet
+        self.hands += 1
+
+    def bot_decision(self, dealer_upcard: Optional[int], rng=random, strategy=None) -> bool:
+        total = self.best_total
+        if self.spot >= MAX_CARDS or total > 21:
+            return False
+        if dealer_upcard is not None and not self.is_soft():
+            index = self.deviations.get((total, dealer_upcard))
+            if index is not None:
+                return self.counter.true_count() < index
+        return super().bot_decision(dealer_upcard, rng, strategy)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    decks = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    engine = TableEngine(random.Random(0), decks=decks)
+    counter = CountingBot.join(engine, "bot2")
+    flat = CountingBot.join(engine, "bot1", max_units=1, deviations={})
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        engine.play_round()
+    elapsed = time.perf_counter() - start
+
+    print(f"{rounds:,} rounds, {decks} deck(s), {rounds / elapsed:,.0f} rounds/s")
+    for name, bot in (("flat bet, table only", flat), ("Hi-Lo count", counter)):
+        per_hand = bot.bankroll / bot.hands if bot.hands else 0.0
+        edge = bot.bankroll / bot.wagered if bot.wagered else 0.0
+        print(f"{name:22s} {bot.hands:,} hands  avg bet {bot.wagered / max(bot.hands, 1):.2f}  "
+              f"won {bot.bankroll:+,d} units ({per_hand:+.4f}/hand, {edge:+.2%} of wagered)")
+    print(f"final running count {counter.counter.running}, true count {counter.counter.true_count():+.2f}")
@@ -0,0 +1,110 @@
+"""
+Exact distribution of the dealer's final hand.
+
+The dealer's rule is fixed: draw while the best total is under 17 (soft 17
+stands), with at most five cards in TableEngine (Player.add_card_value) and
+no limit in v1. Given the upcard and the composition of the shoe (a
+CountShoe), every draw sequence is enumerated with its exact probability.
+
+The result is a tuple of probabilities in OUTCOMES order. A final total
+under 17 can only happen when the five-card limit (or an empty shoe) stops
+the dealer early; those totals (2..16) each keep their own entry, because
+TableEngine compares them with the player's total as they are. Results are
+memoized on (upcard, counts, max_cards) in an LRU
+cache, so a warm lookup costs one dict hit.
+
+    python dealer_odds.py [decks]   # prints the table for a full shoe and times cold/warm lookups
+"""
+from functools import lru_cache
+from typing import Optional
+
+from cards import MAX_CARDS
+from scoring import hand_score
+from shoe import VALUES, CountShoe
+
+# Totals the dealer can be stopped on before reaching 17
+STOPPED_TOTALS = tuple(range(2, 17))
+OUTCOMES = (17, 18, 19, 20, 21, "bust", "blackjack") + STOPPED_TOTALS
+BUST = 5
+BLACKJACK = 6
+# Index of STOPPED_TOTALS[0]; a stopped total t is at UNDER_17 + t - 2
+UNDER_17 = 7
+
+
+def _draw(dist, counts, left, hard, aces, n_cards, prob, max_cards):
+    """Adds the probability of every way the dealer can finish from this hand to 'dist'."""
+    if left == 0:
+        # Nothing left to draw: the dealer stays on a total under 17
+        dist[UNDER_17 + hand_score(hard, aces)[0] - 2] += prob
+        return
+    n_cards += 1
+    for slot in range(10):
+        n = counts[slot]
+        if not n:
+            continue
+        value = VALUES[slot]
+        p = prob * n / left
+        new_hard = hard + (1 if value == 11 else value)
+        new_aces = aces + (value == 11)
+        best = hand_score(new_hard, new_aces)[0]
+
+        if n_cards == 2 and best == 21:
+            dist[BLACKJACK] += p
+        elif best > 21:
+            dist[BUST] += p
+        elif best >= 17:
+            dist[best - 17] += p
+        elif max_cards is not None and n_cards >= max_cards:
+            dist[UNDER_17 + best - 2] += p
+        else:
+            counts[slot] -= 1
+            _draw(dist, counts, left - 1, new_hard, new_aces, n_cards, p, max_cards)
+            counts[slot] += 1
+
+
+@lru_cache(maxsize=1 << 16)
+def dealer_distribution(upcard: int, counts: tuple,
+                        max_cards: Optional[int] = MAX_CARDS) -> tuple:
+    """
+    Probabilities of the dealer ending on each of OUTCOMES, given the upcard
+    (2..11, Ace = 11) and the counts of the cards still in the shoe
+    (CountShoe.key(), upcard already removed). max_cards=None lifts the
+    five-card limit, as in v1.
+    """
+    dist = [0.0] * len(OUTCOMES)
+    hard = 1 if upcard == 11 else upcard
+    _draw(dist, list(counts), sum(counts), hard, int(upcard == 11), 1, 1.0, max_cards)
+    return tuple(dist)
+
+
+def dealer_odds(upcard: int, shoe: CountShoe, max_cards: Optional[int] = MAX_CARDS) -> dict:
+    """dealer_distribution() for a CountShoe, as {outcome: probability}."""
+    return dict(zip(OUTCOMES, dealer_distribution(upcard, shoe.key(), max_cards)))
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    decks = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    # The stopped totals are summed into one column to keep the table narrow
+    print("up  " + "".join(f"{str(o):>10s}" for o in OUTCOMES[:UNDER_17] + ("under 17",)))
+    cold = 0.0
+    for upcard in VALUES:
+        shoe = CountShoe(decks)
+        shoe.remove(upcard)
+        start = time.perf_counter()
+        dist = dealer_distribution(upcard, shoe.key())
+        cold = max(cold, time.perf_counter() - start)
+        print(f"{upcard:2d}  " + "".join(f"{p:10.4f}" for p in dist[:UNDER_17] + (sum(dist[UNDER_17:]),)))
+
+    shoe = CountShoe(decks)
+    shoe.remove(10)
+    key = shoe.key()
+    repeats = 100_000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        dealer_distribution(10, key)
+    warm = (time.perf_counter() - start) / repeats
+    print(f"cold: {cold * 1000:.2f} ms at most per upcard, warm: {warm * 1e6:.2f} us per lookup")
@@ -0,0 +1,8 @@
+"""
+Development switch shared by every version: BLACKJACK_DEBUG=1 in the
+environment turns on diagnostics (frame timers, cache counters, the v7
+debug overlay). Players never see them otherwise.
+"""
+import os
+
+DEBUG = os.environ.get("BLACKJACK_DEBUG", "0") not in ("", "0")
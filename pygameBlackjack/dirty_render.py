@@ -0,0 +1,51 @@
+"""
+Dirty-rectangle rendering for the pygame versions.
+
+The screen is split into named, non-overlapping regions. Each frame the game
+passes every region the small bit of state it depends on; only regions whose
+state changed are cleared and redrawn, and only their rects are pushed with
+pygame.display.update(). A frame where nothing changed costs a few tuple
+comparisons and no drawing at all.
+"""
+import pygame
+
+_UNSET = object()
+
+
+class DirtyRenderer:
+    def __init__(self, screen, background='black'):
+        self.screen = screen
+        self.background = background
+        self._states = {}
+        self._dirty = []
+        # Frames that actually pushed pixels, for profiling
+        self.updates = 0
+
+    def region(self, name, rect, state, draw, *args) -> bool:
+        """
+        Redraws 'rect' with draw(*args) if 'state' differs from last time.
+        Drawing is clipped to 'rect' so a region never paints over its neighbours.
+        Returns True if the region was redrawn.
+        """
+        if self._states.get(name, _UNSET) == state:
+            return False
+        self._states[name] = state
+        self.screen.set_clip(rect)
+        self.screen.fill(self.background, rect)
+        draw(*args)
+        self.screen.set_clip(None)
+        self._dirty.append(pygame.Rect(rect))
+        return True
+
+    def invalidate(self):
+        """Forgets every region's state so the next frame redraws the whole screen."""
+        self._states.clear()
+
+    def flush(self) -> bool:
+        """Pushes the changed rects to the display; returns False if nothing changed."""
+        if not self._dirty:
+            return False
+        pygame.display.update(self._dirty)
+        self._dirty = []
+        self.updates += 1
+        return True
@@ -0,0 +1,116 @@
+"""
+Hit/stand EV hints for the Tk versions, computed off the Tk thread.
+
+A HintWorker owns one background thread that runs strategy.HandSolver
+for the hand it was last asked about. Every request bumps a generation
+number. A solve that is overtaken by a newer request (a new card, a new
+round) notices at its next state and is dropped, and stale results are
+never shown. The Tk thread collects finished hints by polling a queue with
+root.after while a request is outstanding. No Tk call is ever made from
+the worker, and the mainloop never waits on it.
+"""
+import queue
+import threading
+import time
+
+from strategy import DEFAULT_RULES, HandSolver, SolveCancelled
+
+
+class Hint:
+    """EVs for one hand, and how long it took from request to delivery."""
+
+    def __init__(self, stand_ev: float, hit_ev, latency_ms: float = 0.0):
+        self.stand_ev = stand_ev
+        # None when the hand can't take another card
+        self.hit_ev = hit_ev
+        self.latency_ms = latency_ms
+
+    def best(self) -> str:
+        return "Hit" if self.hit_ev is not None and self.hit_ev > self.stand_ev else "Stand"
+
+
+class HintWorker:
+    def __init__(self, root, on_hint, rules: dict = DEFAULT_RULES, poll_ms: int = 10):
+        self.root = root
+        # Called on the Tk thread with a Hint
+        self.on_hint = on_hint
+        self.rules = rules
+        self.poll_ms = poll_ms
+        self._generation = 0
+        # Generation the Tk thread still expects a hint for, or None
+        self._waiting_for = None
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._polling = False
+        self._thread = threading.Thread(target=self._work, name="hint-worker", daemon=True)
+        self._thread.start()
+
+        # Instrumentation for the debug overlay
+        self.delivered = 0
+        self.cancelled = 0
+        self.total_latency_ms = 0.0
+        self.last_latency_ms = 0.0
+
+    def request(self, total: int, soft: bool, n_cards: int, upcard: int, counts):
+        """Asks for the EVs of a hand; any hint still being computed is abandoned."""
+        self._generation += 1
+        self._waiting_for = self._generation
+        self._requests.put((self._generation, (total, soft, n_cards, upcard, tuple(counts)),
+                            time.perf_counter()))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """Drops whatever is queued or running, e.g. when the round ends."""
+        self._generation += 1
+        self._waiting_for = None
+
+    def stop(self):
+        self.cancel()
+        self._requests.put(None)
+
+    def average_latency_ms(self) -> float:
+        return self.total_latency_ms / self.delivered if self.delivered else 0.0
+
+    def _work(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            generation, (total, soft, n_cards, upcard, counts), requested = item
+            if generation != self._generation:
+                self.cancelled += 1
+                continue
+            try:
+                solver = HandSolver(upcard, counts, self.rules,
+                                    cancelled=lambda: generation != self._generation)
+                stand, hit = solver.evs(total, soft, n_cards)
+            except SolveCancelled:
+                self.cancelled += 1
+                continue
+            self._results.put((generation, stand, hit, requested))
+
+    def _poll(self):
+        latest = None
+        while True:
+            try:
+                latest = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+        if self._waiting_for is None:
+            # Cancelled; nothing left to deliver
+            self._polling = False
+            return
+        if latest is not None and latest[0] == self._waiting_for:
+            _, stand, hit, requested = latest
+            hint = Hint(stand, hit, (time.perf_counter() - requested) * 1000)
+            self.delivered += 1
+            self.total_latency_ms += hint.latency_ms
+            self.last_latency_ms = hint.latency_ms
+            self._waiting_for = None
+            self._polling = False
+            self.on_hint(hint)
+            return
+        self.root.after(self.poll_ms, self._poll)
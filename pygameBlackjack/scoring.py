@@ -0,0 +1,72 @@
+"""
+Shared blackjack scoring kernel.
+
+A hand is fully described by its hard total (every Ace counted as 1) and
+how many Aces it holds. SCORE_TABLE maps that pair to (best_total, soft)
+so scoring is a single lookup instead of a loop over the cards.
+"""
+
+# Hard totals above this are bust whatever the Aces do; they share the last row
+MAX_HARD = 31
+# Only one Ace can ever count as 11, so "one or more" is all the table needs
+MAX_ACES = 1
+
+
+def _build_table():
+    table = []
+    for hard in range(MAX_HARD + 1):
+        row = []
+        for aces in range(MAX_ACES + 1):
+            if aces and hard + 10 <= 21:
+                row.append((hard + 10, True))
+            else:
+                row.append((hard, False))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+# SCORE_TABLE[hard_total][ace_count] -> (best_total, soft)
+SCORE_TABLE = _build_table()
+
+
+def hand_score(hard_total: int, aces: int):
+    """Returns (best_total, soft) for a hand with the given hard total and Ace count."""
+    if hard_total > MAX_HARD:
+        return hard_total, False
+    return SCORE_TABLE[hard_total][1 if aces else 0]
+
+
+class HandScorer:
+    """
+    Caches the score of one hand list until it changes.
+
+    'hard_values' maps a card (whatever the UI stores in its hand lists) to
+    its hard value, with Aces worth 1. Hands only grow during a round and
+    are replaced by a new list on a new hand, so only the newly appended
+    cards are ever looked at.
+    """
+
+    def __init__(self, hard_values):
+        self.hard_values = hard_values
+        self._hand = None
+        self._seen = 0
+        self._hard = 0
+        self._aces = 0
+        self.total = 0
+        self.soft = False
+
+    def __call__(self, hand) -> int:
+        if hand is not self._hand or len(hand) < self._seen:
+            self._hand = hand
+            self._seen = 0
+            self._hard = 0
+            self._aces = 0
+        if len(hand) != self._seen:
+            for card in hand[self._seen:]:
+                value = self.hard_values[card]
+                self._hard += value
+                if value == 1:
+                    self._aces += 1
+            self._seen = len(hand)
+            self.total, self.soft = hand_score(self._hard, self._aces)
+        return self.total
@@ -0,0 +1,120 @@
+import random
+from typing import Optional
+
+
+class Shoe:
+    """
+    'decks' copies of 'cards', shuffled once and dealt by advancing a cursor.
+    len(), iteration and 'in' cover the cards not dealt yet. needs_shuffle()
+    turns True once the cut card, after 'penetration' (0..1) of the shoe, is dealt.
+    """
+
+    def __init__(self, cards, rng: Optional[random.Random] = None, decks: int = 1,
+                 penetration: float = 1.0):
+        if not 0.0 < penetration <= 1.0:
+            raise ValueError(f"penetration must be in (0, 1], got {penetration}")
+        self.rng = rng if rng is not None else random.Random()
+        self.cards = list(cards) * decks
+        self.decks = decks
+        self.penetration = penetration
+        # Index of the cut card: dealing past it triggers a reshuffle
+        self.cut = int(len(self.cards) * penetration)
+        self.cursor = 0
+        self.shuffle()
+
+    def shuffle(self):
+        """Puts every card back and shuffles in place (random.shuffle is a Fisher-Yates shuffle)."""
+        self.rng.shuffle(self.cards)
+        self.cursor = 0
+
+    def needs_shuffle(self) -> bool:
+        """True once the cut card has come out."""
+        return self.cursor >= self.cut
+
+    def deal(self):
+        """Returns the next card. Raises IndexError if the shoe is empty."""
+        if self.cursor >= len(self.cards):
+            raise IndexError("deal from an empty shoe")
+        card = self.cards[self.cursor]
+        self.cursor += 1
+        return card
+
+    def __len__(self):
+        return len(self.cards) - self.cursor
+
+    def __iter__(self):
+        """Iterates over the cards that have not been dealt yet."""
+        return iter(self.cards[self.cursor:])
+
+    def __contains__(self, card):
+        return card in self.cards[self.cursor:]
+
+
+# Blackjack values a card can have, in CountShoe slot order (11 is the Ace)
+VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+# How many cards of each value one 52-card deck holds
+DECK_COUNTS = (4, 4, 4, 4, 4, 4, 4, 4, 16, 4)
+
+
+class CountShoe:
+    """
+    A shoe stored as how many cards of each blackjack value (VALUES) are left.
+    Drawing is a weighted pick over the ten counts; the probability of the
+    next value is a single division.
+    """
+
+    def __init__(self, decks: int = 1, rng: Optional[random.Random] = None, counts=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.decks = decks
+        if counts is None:
+            counts = [n * decks for n in DECK_COUNTS]
+        self.counts = list(counts)
+        self.total = sum(self.counts)
+
+    def reset(self):
+        """Puts every card back."""
+        self.counts = [n * self.decks for n in DECK_COUNTS]
+        self.total = sum(self.counts)
+
+    def draw(self) -> int:
+        """Draws one card and returns its value (2..11). Raises IndexError if empty."""
+        if self.total <= 0:
+            raise IndexError("draw from an empty shoe")
+        r = self.rng.randrange(self.total)
+        counts = self.counts
+        # Ten fixed slots, so the cumulative scan is constant time
+        for i in range(10):
+            r -= counts[i]
+            if r < 0:
+                counts[i] -= 1
+                self.total -= 1
+                return VALUES[i]
+        raise AssertionError("counts out of sync with total")
+
+    def remove(self, value: int):
+        """Takes a known card of the given value (2..11) out of the shoe."""
+        i = value - 2
+        if self.counts[i] <= 0:
+            raise ValueError(f"no card of value {value} left in the shoe")
+        self.counts[i] -= 1
+        self.total -= 1
+
+    def probability(self, value: int) -> float:
+        """Exact probability that the next card has the given value."""
+        if self.total == 0:
+            return 0.0
+        return self.counts[value - 2] / self.total
+
+    def probabilities(self):
+        """Exact probability of each value in VALUES order."""
+        if self.total == 0:
+            return (0.0,) * 10
+        total = self.total
+        return tuple(n / total for n in self.counts)
+
+    def key(self):
+        """Hashable snapshot of the composition, for memoizing on it."""
+        return tuple(self.counts)
+
+    def __len__(self):
+        return self.total
@@ -0,0 +1,514 @@
+"""
+Monte Carlo simulator for the TableEngine table rules.
+
+Batches of rounds are played at once as NumPy arrays, each round on its own
+lazily shuffled deck; with Numba installed a compiled scalar loop does the
+same work. simulate() spreads the rounds over a process pool.
+
+Policies are hit probabilities indexed [soft][best_total][dealer_upcard].
+The bots default to BOT_POLICY, the legacy rule of TableEngine(bot_strategy=None);
+bot_policy=strategy_for(decks).policy_table() approximates v7's bots (it
+holds the two-card decisions only).
+
+    python simulator.py [rounds] [policy]   # reports each policy and cross-checks it against TableEngine
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from cards import CARD_VALUES, FULL_DECK, MAX_CARDS, TOTALS, UPCARDS
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, the NumPy path gives the same results
+    njit = None
+
+# Card values of one deck in FULL_DECK order (Ace = 11)
+DECK_VALUES = np.array([CARD_VALUES[card] for card in FULL_DECK], dtype=np.int64)
+DECK_SIZE = len(DECK_VALUES)
+
+# Seats, in the order TableEngine deals the first two cards
+DEALER, PLAYER, BOT1, BOT2 = 0, 1, 2, 3
+DEAL_ORDER = np.array([DEALER, DEALER, PLAYER, PLAYER, BOT1, BOT1, BOT2, BOT2], dtype=np.int64)
+
+# Round outcome codes, as TableEngine.outcome
+OPEN, PLAYER_WINS, DEALER_WINS, TIE = 0, 1, 2, 3
+
+# Layout of the counts array the simulation kernels return
+COUNT_FIELDS = ("rounds", "player_wins", "dealer_wins", "ties",
+                "bot_hands", "bot_wins", "bot_losses", "bot_ties")
+
+
+def policy_table(hit_probability) -> np.ndarray:
+    """
+    Tabulates a policy: hit_probability(total, soft, upcard) -> chance (0..1) of hitting.
+    Totals over 21 never hit.
+    """
+    table = np.zeros((2, TOTALS, UPCARDS))
+    for soft in (0, 1):
+        for total in range(2, 22):
+            for upcard in range(2, UPCARDS):
+                table[soft, total, upcard] = hit_probability(total, bool(soft), upcard)
+    return table
+
+
+def bot_hit_probability(total: int, soft: bool, upcard: int) -> float:
+    """The legacy Player.bot_decision (no strategy table) as a probability."""
+    if total < 12:
+        return 1.0
+    if total >= 19:
+        return 0.0
+    return 0.3 if upcard <= 6 else 0.6
+
+
+def hit_below(threshold: int) -> np.ndarray:
+    """Hits while the best total is below 'threshold' (the dealer's rule is hit_below(17))."""
+    return policy_table(lambda total, soft, upcard: float(total < threshold))
+
+
+STAND_POLICY = policy_table(lambda total, soft, upcard: 0.0)
+# Legacy bots: a random 30%/60% hit from 12 to 18, as TableEngine(bot_strategy=None)
+BOT_POLICY = policy_table(bot_hit_probability)
+
+POLICIES = {
+    "stand": STAND_POLICY,
+    "bot": BOT_POLICY,
+    "hit<12": hit_below(12),
+    "hit<15": hit_below(15),
+    "hit<17": hit_below(17),
+}
+
+
+def engine_policy(table: np.ndarray, rng=random):
+    """Adapts a policy table to TableEngine.play_round's player_policy(engine) -> bool."""
+    def policy(engine) -> bool:
+        player = engine.player
+        if player.spot >= MAX_CARDS:
+            return False
+        chance = table[int(player.is_soft()), player.best_total, engine.dealer.cards_values[0]]
+        return chance > 0.0 and rng.random() < chance
+    return policy
+
+
+class SimResult:
+    """
+    Outcome counts for the player and the two bots over a number of rounds.
+    Counts are integers, so results of separate batches add up exactly.
+
+    Bots only play in rounds that reach the showdown (when the dealer or the
+    player makes 21 up front, or the player busts, the round ends first), so
+    their rates are per showdown hand.
+    """
+
+    def __init__(self, counts=None):
+        if counts is None:
+            counts = np.zeros(len(COUNT_FIELDS), dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    def __getattr__(self, name):
+        if name in COUNT_FIELDS:
+            return int(self.counts[COUNT_FIELDS.index(name)])
+        raise AttributeError(name)
+
+    def __add__(self, other: 'SimResult') -> 'SimResult':
+        return SimResult(self.counts + other.counts)
+
+    def __eq__(self, other):
+        return isinstance(other, SimResult) and np.array_equal(self.counts, other.counts)
+
+    def win_rate(self) -> float:
+        return self.player_wins / self.rounds if self.rounds else 0.0
+
+    def loss_rate(self) -> float:
+        return self.dealer_wins / self.rounds if self.rounds else 0.0
+
+    def push_rate(self) -> float:
+        return self.ties / self.rounds if self.rounds else 0.0
+
+    def ev(self) -> float:
+        """Expected units won per round for an even-money bet of 1 (every win pays 1:1 here)."""
+        return (self.player_wins - self.dealer_wins) / self.rounds if self.rounds else 0.0
+
+    def bot_ev(self) -> float:
+        return (self.bot_wins - self.bot_losses) / self.bot_hands if self.bot_hands else 0.0
+
+    def report(self) -> str:
+        return (f"{self.rounds:,} rounds: win {self.win_rate():.4f}  lose {self.loss_rate():.4f}  "
+                f"push {self.push_rate():.4f}  EV {self.ev():+.4f}  (bots EV {self.bot_ev():+.4f})")
+
+
+# ---------------------- NumPy path ----------------------
+# The round kernels below are shared with table_env.VecTableEnv
+def deal_cards(decks, cursor, rows, rng):
+    """
+    Deals the next card of each round in 'rows' from that round's own deck.
+    decks is every round's 52 values back to back; the deck is shuffled
+    lazily, one Fisher-Yates step per dealt card.
+    """
+    pos = cursor[rows]
+    base = rows * DECK_SIZE
+    pick = base + pos + (rng.random(len(rows)) * (DECK_SIZE - pos)).astype(np.int64)
+    card = decks[pick]
+    # A full swap keeps every deck a permutation of one deck, so it can be dealt
+    # again just by moving the cursor back, and the dealt cards stay readable in order
+    decks[pick] = decks[base + pos]
+    decks[base + pos] = card
+    cursor[rows] = pos + 1
+    return card
+
+
+def add_cards(hard, aces, seat, rows, card):
+    """Adds one card value per round in 'rows' to the hands of 'seat'."""
+    is_ace = card == 11
+    hard[seat, rows] += card - 10 * is_ace
+    aces[seat, rows] |= is_ace
+
+
+def best_totals(hard, aces, seat, rows):
+    """Best totals of 'seat' in 'rows', and whether they are soft."""
+    h = hard[seat, rows]
+    soft = aces[seat, rows] & (h <= 11)
+    return h + 10 * soft, soft
+
+
+def _take_turn(hard, aces, seat, rows, upcard, policy, decks, cursor, rng):
+    """Lets 'seat' hit in every round of 'rows' until it stands, busts or holds five cards."""
+    for _ in range(MAX_CARDS - 2):
+        best, soft = best_totals(hard, aces, seat, rows)
+        hit = rng.random(len(rows)) < policy[soft.astype(np.int64), best, upcard[rows]]
+        rows = rows[hit]
+        if not len(rows):
+            break
+        add_cards(hard, aces, seat, rows, deal_cards(decks, cursor, rows, rng))
+
+
+def open_rounds(decks, cursor, hard, aces, upcard, outcome, rows, rng):
+    """
+    Deals two cards to every seat of the (empty) hands in 'rows', in
+    TableEngine.shuffle_deck's order, and settles what check_immediate_outcomes would.
+    """
+    for i, seat in enumerate(DEAL_ORDER):
+        card = deal_cards(decks, cursor, rows, rng)
+        if i == 0:
+            upcard[rows] = card
+        add_cards(hard, aces, seat, rows, card)
+
+    # 21 on the first two cards ends the round
+    dealer_21 = best_totals(hard, aces, DEALER, rows)[0] == 21
+    player_21 = best_totals(hard, aces, PLAYER, rows)[0] == 21
+    outcome[rows] = OPEN
+    outcome[rows[dealer_21 & player_21]] = TIE
+    outcome[rows[dealer_21 & ~player_21]] = DEALER_WINS
+    outcome[rows[player_21 & ~dealer_21]] = PLAYER_WINS
+
+
+def play_showdown(decks, cursor, hard, aces, upcard, outcome, rows, bot_policy, rng):
+    """
+    TableEngine.stand() for every round in 'rows': the bots play, the dealer
+    draws to 17, then final_comparison. Returns the dealer's totals.
+    """
+    _take_turn(hard, aces, BOT1, rows, upcard, bot_policy, decks, cursor, rng)
+    _take_turn(hard, aces, BOT2, rows, upcard, bot_policy, decks, cursor, rng)
+    dealer_rows = rows
+    for _ in range(MAX_CARDS - 2):
+        dealer_rows = dealer_rows[best_totals(hard, aces, DEALER, dealer_rows)[0] < 17]
+        if not len(dealer_rows):
+            break
+        add_cards(hard, aces, DEALER, dealer_rows, deal_cards(decks, cursor, dealer_rows, rng))
+
+    dealer = best_totals(hard, aces, DEALER, rows)[0]
+    player = best_totals(hard, aces, PLAYER, rows)[0]
+    dealer_bust = dealer > 21
+    outcome[rows[dealer_bust | (player > dealer)]] = PLAYER_WINS
+    outcome[rows[~dealer_bust & (player < dealer)]] = DEALER_WINS
+    outcome[rows[~dealer_bust & (player == dealer)]] = TIE
+    return dealer
+
+
+def _simulate_batch(n_rounds: int, player_policy, bot_policy, rng) -> np.ndarray:
+    decks = np.tile(DECK_VALUES, n_rounds)
+    cursor = np.zeros(n_rounds, dtype=np.int64)
+    hard = np.zeros((4, n_rounds), dtype=np.int64)
+    aces = np.zeros((4, n_rounds), dtype=bool)
+    upcard = np.zeros(n_rounds, dtype=np.int64)
+    outcome = np.zeros(n_rounds, dtype=np.int8)
+    open_rounds(decks, cursor, hard, aces, upcard, outcome, np.arange(n_rounds), rng)
+
+    # Player's turn: every hit is settled at once on 21 or a bust
+    active = np.flatnonzero(outcome == OPEN)
+    for _ in range(MAX_CARDS - 2):
+        best, soft = best_totals(hard, aces, PLAYER, active)
+        hit = rng.random(len(active)) < player_policy[soft.astype(np.int64), best, upcard[active]]
+        active = active[hit]
+        if not len(active):
+            break
+        add_cards(hard, aces, PLAYER, active, deal_cards(decks, cursor, active, rng))
+        best = best_totals(hard, aces, PLAYER, active)[0]
+        outcome[active[best == 21]] = PLAYER_WINS
+        outcome[active[best > 21]] = DEALER_WINS
+        active = active[best < 21]
+
+    showdown = np.flatnonzero(outcome == OPEN)
+    dealer = play_showdown(decks, cursor, hard, aces, upcard, outcome, showdown, bot_policy, rng)
+    dealer_bust = dealer > 21
+
+    counts = np.zeros(len(COUNT_FIELDS), dtype=np.int64)
+    counts[0] = n_rounds
+    counts[1:4] = np.bincount(outcome, minlength=4)[1:]
+    for seat in (BOT1, BOT2):
+        bot = best_totals(hard, aces, seat, showdown)[0]
+        bust = bot > 21
+        win = ~bust & (dealer_bust | (bot > dealer))
+        tie = ~bust & ~dealer_bust & (bot == dealer)
+        counts[4] += len(showdown)
+        counts[5] += np.count_nonzero(win)
+        counts[6] += len(showdown) - np.count_nonzero(win) - np.count_nonzero(tie)
+        counts[7] += np.count_nonzero(tie)
+    return counts
+
+
+def simulate_numpy(n_rounds: int, player_policy=STAND_POLICY, bot_policy=BOT_POLICY,
+                   rng: Optional[np.random.Generator] = None, batch: int = 1 << 13) -> SimResult:
+    """Plays 'n_rounds' rounds in batches of 'batch' rounds (bounded memory, cache friendly)."""
+    rng = rng if rng is not None else np.random.default_rng()
+    result = SimResult()
+    for start in range(0, n_rounds, batch):
+        result += SimResult(_simulate_batch(min(batch, n_rounds - start), player_policy, bot_policy, rng))
+    return result
+
+
+# ---------------------- scalar path (compiled by Numba when available) ----------------------
+def _deal_scalar(deck, pos):
+    pick = pos + int(np.random.random() * (DECK_SIZE - pos))
+    card = deck[pick]
+    deck[pick] = deck[pos]
+    deck[pos] = card
+    return card
+
+
+def _best_scalar(hard, aces):
+    if aces > 0 and hard <= 11:
+        return hard + 10, 1
+    return hard, 0
+
+
+def _play_rounds_scalar(n_rounds, player_policy, bot_policy, seed):
+    """Same rules as _simulate_batch, one round at a time."""
+    np.random.seed(seed)
+    # The deck stays a permutation of one deck, so every round just reshuffles from position 0
+    deck = DECK_VALUES.copy()
+    hard = np.zeros(4, dtype=np.int64)
+    aces = np.zeros(4, dtype=np.int64)
+    ncards = np.zeros(4, dtype=np.int64)
+    counts = np.zeros(8, dtype=np.int64)
+
+    for _ in range(n_rounds):
+        hard[:] = 0
+        aces[:] = 0
+        ncards[:] = 0
+        pos = 0
+        for i in range(len(DEAL_ORDER)):
+            seat = DEAL_ORDER[i]
+            card = _deal_scalar(deck, pos)
+            pos += 1
+            hard[seat] += 1 if card == 11 else card
+            aces[seat] += card == 11
+            ncards[seat] += 1
+        upcard = deck[0]
+
+        counts[0] += 1
+        dealer = _best_scalar(hard[DEALER], aces[DEALER])[0]
+        player = _best_scalar(hard[PLAYER], aces[PLAYER])[0]
+        if dealer == 21 and player == 21:
+            counts[3] += 1
+            continue
+        if dealer == 21:
+            counts[2] += 1
+            continue
+        if player == 21:
+            counts[1] += 1
+            continue
+
+        settled = False
+        while ncards[PLAYER] < MAX_CARDS:
+            player, soft = _best_scalar(hard[PLAYER], aces[PLAYER])
+            if not np.random.random() < player_policy[soft, player, upcard]:
+                break
+            card = _deal_scalar(deck, pos)
+            pos += 1
+            hard[PLAYER] += 1 if card == 11 else card
+            aces[PLAYER] += card == 11
+            ncards[PLAYER] += 1
+            player = _best_scalar(hard[PLAYER], aces[PLAYER])[0]
+            if player == 21:
+                counts[1] += 1
+                settled = True
+                break
+            if player > 21:
+                counts[2] += 1
+                settled = True
+                break
+        if settled:
+            continue
+
+        for seat in (BOT1, BOT2):
+            while ncards[seat] < MAX_CARDS:
+                total, soft = _best_scalar(hard[seat], aces[seat])
+                if not np.random.random() < bot_policy[soft, total, upcard]:
+                    break
+                card = _deal_scalar(deck, pos)
+                pos += 1
+                hard[seat] += 1 if card == 11 else card
+                aces[seat] += card == 11
+                ncards[seat] += 1
+        while ncards[DEALER] < MAX_CARDS and _best_scalar(hard[DEALER], aces[DEALER])[0] < 17:
+            card = _deal_scalar(deck, pos)
+            pos += 1
+            hard[DEALER] += 1 if card == 11 else card
+            aces[DEALER] += card == 11
+            ncards[DEALER] += 1
+
+        dealer = _best_scalar(hard[DEALER], aces[DEALER])[0]
+        player = _best_scalar(hard[PLAYER], aces[PLAYER])[0]
+        if dealer > 21 or player > dealer:
+            counts[1] += 1
+        elif player < dealer:
+            counts[2] += 1
+        else:
+            counts[3] += 1
+        for seat in (BOT1, BOT2):
+            bot = _best_scalar(hard[seat], aces[seat])[0]
+            counts[4] += 1
+            if bot > 21:
+                counts[6] += 1
+            elif dealer > 21 or bot > dealer:
+                counts[5] += 1
+            elif bot < dealer:
+                counts[6] += 1
+            else:
+                counts[7] += 1
+    return counts
+
+
+if njit is not None:
+    _deal_scalar = njit(cache=True)(_deal_scalar)
+    _best_scalar = njit(cache=True)(_best_scalar)
+    _play_rounds_scalar = njit(cache=True)(_play_rounds_scalar)
+
+
+def simulate_numba(n_rounds: int, player_policy=STAND_POLICY, bot_policy=BOT_POLICY,
+                   seed: int = 0) -> SimResult:
+    """Compiled scalar loop; raises RuntimeError if Numba isn't installed."""
+    if njit is None:
+        raise RuntimeError("numba is not installed; use simulate_numpy()")
+    return SimResult(_play_rounds_scalar(n_rounds, player_policy, bot_policy, seed))
+
+
+# ---------------------- multiprocess ----------------------
+# Rounds per unit of work. The rounds are always cut into the same chunks,
+# each seeded by its own spawned SeedSequence, so which worker plays a chunk
+# (and how many workers there are) never changes the result.
+CHUNK_ROUNDS = 1 << 18
+
+
+def _simulate_chunk(n_rounds: int, player_policy, bot_policy, seed_seq) -> SimResult:
+    if njit is not None:
+        return simulate_numba(n_rounds, player_policy, bot_policy, int(seed_seq.generate_state(1)[0] >> 1))
+    return simulate_numpy(n_rounds, player_policy, bot_policy, np.random.default_rng(seed_seq))
+
+
+def tree_reduce(results) -> SimResult:
+    """Adds results pairwise, level by level, so the sum has log2(len) depth."""
+    results = list(results)
+    if not results:
+        return SimResult()
+    while len(results) > 1:
+        paired = [a + b for a, b in zip(results[::2], results[1::2])]
+        if len(results) % 2:
+            paired.append(results[-1])
+        results = paired
+    return results[0]
+
+
+def simulate(n_rounds: int, policy=STAND_POLICY, workers: Optional[int] = None, seed: int = 0,
+             bot_policy=BOT_POLICY, chunk_rounds: int = CHUNK_ROUNDS) -> SimResult:
+    """
+    Plays 'n_rounds' rounds of 'policy' (a table or a POLICIES name) on
+    'workers' processes (default: every core). The same seed gives the same
+    counts whatever the worker count.
+    """
+    if isinstance(policy, str):
+        policy = POLICIES[policy]
+    workers = workers or os.cpu_count() or 1
+
+    n_chunks = -(-n_rounds // chunk_rounds)
+    sizes = [min(chunk_rounds, n_rounds - i * chunk_rounds) for i in range(n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    args = (sizes, [policy] * n_chunks, [bot_policy] * n_chunks, seeds)
+
+    if workers == 1 or n_chunks <= 1:
+        return tree_reduce(map(_simulate_chunk, *args))
+    with ProcessPoolExecutor(max_workers=min(workers, n_chunks)) as pool:
+        return tree_reduce(pool.map(_simulate_chunk, *args))
+
+
+def engine_result(n_rounds: int, player_policy=STAND_POLICY, seed: int = 0) -> SimResult:
+    """
+    Plays the same rounds through TableEngine (a fresh deck every round, as
+    the simulator deals), for cross-checking the vectorized rules.
+    """
+    from table_engine import TableEngine
+
+    rng = random.Random(seed)
+    # A cut card at the very top reshuffles before every round; the bots use
+    # the legacy rule BOT_POLICY describes
+    engine = TableEngine(rng, decks=1, penetration=0.01, bot_strategy=None)
+    policy = engine_policy(player_policy, rng)
+
+    counts = np.zeros(len(COUNT_FIELDS), dtype=np.int64)
+    bot_results = []
+    engine.subscribe("summary", lambda d, p, outcome, bot1, bot2: bot_results.extend((bot1, bot2)))
+    for _ in range(n_rounds):
+        engine.play_round(policy)
+    for result in bot_results:
+        counts[4] += 1
+        if result.startswith("Win"):
+            counts[5] += 1
+        elif result == "Tie":
+            counts[7] += 1
+        else:
+            counts[6] += 1
+    counts[:4] = n_rounds, engine.player_wins, engine.dealer_wins, engine.ties
+    return SimResult(counts)
+
+
+if __name__ == '__main__':
+    import sys
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    names = sys.argv[2:] or list(POLICIES)
+    check_rounds = 100_000
+
+    print("numba:", "yes" if njit is not None else "not installed, NumPy path only")
+    simulate_numpy(10_000, rng=np.random.default_rng(0))  # warm-up
+    for name in names:
+        table = POLICIES[name]
+        start = time.perf_counter()
+        result = simulate_numpy(rounds, table, rng=np.random.default_rng(0))
+        elapsed = time.perf_counter() - start
+        print(f"[{name}] numpy  {result.report()}  {rounds / elapsed:,.0f} rounds/s")
+        if njit is not None:
+            simulate_numba(1000, table)  # compile
+            start = time.perf_counter()
+            result = simulate_numba(rounds, table, seed=0)
+            elapsed = time.perf_counter() - start
+            print(f"[{name}] numba  {result.report()}  {rounds / elapsed:,.0f} rounds/s")
+        reference = engine_result(check_rounds, table)
+        # Three standard errors of the EV difference between the two estimates
+        tolerance = 3 * (2 / check_rounds) ** 0.5
+        status = "ok" if abs(reference.ev() - result.ev()) <= tolerance else "MISMATCH"
+        print(f"[{name}] engine {reference.report()}  ({status})")
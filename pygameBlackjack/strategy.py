@@ -0,0 +1,244 @@
+"""
+Hit/stand strategy tables solved for the table's rules, cached on disk.
+
+For every dealer upcard the shoe's composition (minus the upcard) gives the
+exact distribution of the dealer's final hand (dealer_odds), conditioned on
+the dealer not holding 21 (that ends the round before anyone acts). The
+expected value of standing and of hitting is then worked out for every
+(total, soft, cards in hand) and the better action is kept. The player's
+own cards are not taken out of the shoe, which is the usual basic-strategy
+simplification.
+
+The rules of this game matter: a player who reaches 21 wins on the spot,
+nobody holds more than five cards, and a dealer stopped at five cards
+under 17 keeps that total, which the player's total is compared against
+as it is.
+
+The result is compiled into a flat bytes object (1 = hit, 0 = stand),
+looked up in O(1), and written to STRATEGY_DIR under a key built from the
+rules, so a later start just reads the file.
+
+    python strategy.py [decks]   # prints the chart and the solve/load times
+"""
+import hashlib
+import json
+import os
+from typing import Optional
+
+from atomic_write import write_atomically
+from cards import MAX_CARDS, TOTALS, UPCARDS
+from dealer_odds import BLACKJACK, OUTCOMES, dealer_distribution
+from scoring import hand_score
+from shoe import VALUES, CountShoe
+
+STRATEGY_DIR = "strategies"
+
+# Lookup layout: [cards in hand][soft][best total][dealer upcard]
+CARD_SLOTS = MAX_CARDS + 1
+TABLE_SIZE = CARD_SLOTS * 2 * TOTALS * UPCARDS
+
+# Rules of TableEngine / blackjack_v7
+DEFAULT_RULES = {
+    "decks": 1,
+    "dealer_max_cards": MAX_CARDS,
+    "player_max_cards": MAX_CARDS,
+    # Reaching 21 ends the round with a win (check_immediate_outcomes)
+    "twenty_one_wins": True,
+    "version": 2,
+}
+
+
+def table_index(total: int, soft: bool, upcard: int, n_cards: int) -> int:
+    return ((min(n_cards, CARD_SLOTS - 1) * 2 + soft) * TOTALS + min(total, TOTALS - 1)) * UPCARDS + upcard
+
+
+class StrategyTable:
+    """A solved hit/stand table for one rules config."""
+
+    def __init__(self, actions: bytes, rules: dict):
+        if len(actions) != TABLE_SIZE:
+            raise ValueError(f"strategy table must hold {TABLE_SIZE} entries, got {len(actions)}")
+        self.actions = bytes(actions)
+        self.rules = dict(rules)
+
+    def should_hit(self, total: int, soft: bool, upcard: int, n_cards: int = 2) -> bool:
+        return self.actions[table_index(total, soft, upcard, n_cards)] == 1
+
+    def policy_table(self, n_cards: int = 2):
+        """The decisions for 'n_cards' cards in hand as a simulator policy table."""
+        import numpy as np
+
+        table = np.zeros((2, TOTALS, UPCARDS))
+        for soft in (0, 1):
+            for total in range(TOTALS):
+                for upcard in range(2, UPCARDS):
+                    table[soft, total, upcard] = self.actions[table_index(total, soft, upcard, n_cards)]
+        return table
+
+    def chart(self, n_cards: int = 2) -> str:
+        """Text chart: H/S per total (rows) and dealer upcard (columns)."""
+        lines = ["       " + " ".join(f"{u:>2d}" for u in VALUES)]
+        for soft, totals in ((0, range(4, 21)), (1, range(12, 21))):
+            for total in totals:
+                row = " ".join(" H" if self.should_hit(total, bool(soft), u, n_cards) else " S"
+                               for u in VALUES)
+                lines.append(f"{'soft' if soft else 'hard'} {total:2d} {row}")
+        return "\n".join(lines)
+
+
+def rules_key(rules: dict) -> str:
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def strategy_path(rules: dict) -> str:
+    return os.path.join(STRATEGY_DIR, f"strategy_{rules_key(rules)}.bin")
+
+
+# Dealer total of each OUTCOMES entry, with a bust as 0 so any standing hand beats it
+# (a dealer blackjack ends the round first, so HandSolver gives it no weight)
+FINAL_TOTALS = tuple(o if isinstance(o, int) else 0 for o in OUTCOMES)
+
+
+def _stand_ev(total: int, finals) -> float:
+    """EV of standing on 'total' against the dealer's final distribution (dealer_odds.OUTCOMES)."""
+    win = lose = 0.0
+    for dealer_total, p in zip(FINAL_TOTALS, finals):
+        if total > dealer_total:
+            win += p
+        elif total < dealer_total:
+            lose += p
+    return win - lose
+
+
+class SolveCancelled(Exception):
+    """Raised inside a HandSolver when its 'cancelled' callback turns True."""
+
+
+class HandSolver:
+    """
+    EVs of standing and hitting against one dealer upcard, with the unseen
+    cards given as ten counts in CountShoe order. States are memoized, so
+    asking about every total costs about as much as asking about one.
+    """
+
+    def __init__(self, upcard: int, counts, rules: dict = DEFAULT_RULES, cancelled=None):
+        self.rules = rules
+        self.max_cards = rules["player_max_cards"]
+        # Checked at every new state; lets another thread abandon a stale solve
+        self.cancelled = cancelled
+        counts = tuple(counts)
+        dist = dealer_distribution(upcard, counts, rules["dealer_max_cards"])
+        no_blackjack = 1.0 - dist[BLACKJACK]
+        self.finals = [p / no_blackjack if i != BLACKJACK else 0.0 for i, p in enumerate(dist)]
+        left = sum(counts)
+        self.draws = [(value, n / left) for value, n in zip(VALUES, counts) if n]
+        # (total, soft, n_cards) -> (stand EV, hit EV or None when no card may be drawn)
+        self.memo = {}
+
+    def evs(self, total: int, soft: bool, n_cards: int):
+        """(stand EV, hit EV) for a live hand; hit EV is None at the card limit."""
+        key = (total, soft, n_cards)
+        if key not in self.memo:
+            if self.cancelled is not None and self.cancelled():
+                raise SolveCancelled()
+            stand = _stand_ev(total, self.finals)
+            hit = None
+            if n_cards < self.max_cards:
+                hard = total - 10 * soft
+                hit = 0.0
+                for value, p in self.draws:
+                    new_total, new_soft = hand_score(hard + (1 if value == 11 else value),
+                                                     soft or value == 11)
+                    hit += p * self.best_ev(new_total, new_soft, n_cards + 1)
+            self.memo[key] = (stand, hit)
+        return self.memo[key]
+
+    def best_ev(self, total: int, soft: bool, n_cards: int) -> float:
+        if total > 21:
+            return -1.0
+        if total == 21 and self.rules["twenty_one_wins"]:
+            return 1.0
+        stand, hit = self.evs(total, soft, n_cards)
+        return stand if hit is None else max(stand, hit)
+
+    def should_hit(self, total: int, soft: bool, n_cards: int) -> bool:
+        stand, hit = self.evs(total, soft, n_cards)
+        return hit is not None and hit > stand
+
+
+def solve(rules: dict) -> StrategyTable:
+    """Works out the EV-maximizing action for every entry of the table."""
+    actions = bytearray(TABLE_SIZE)
+    for upcard in VALUES:
+        shoe = CountShoe(rules["decks"])
+        shoe.remove(upcard)
+        solver = HandSolver(upcard, shoe.key(), rules)
+        for n_cards in range(2, CARD_SLOTS):
+            for soft in (False, True):
+                for total in range(4 if not soft else 12, 21):
+                    actions[table_index(total, soft, upcard, n_cards)] = solver.should_hit(total, soft, n_cards)
+    return StrategyTable(actions, rules)
+
+
+def save_strategy(table: StrategyTable) -> str:
+    path = strategy_path(table.rules)
+    os.makedirs(STRATEGY_DIR, exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(table.actions)
+
+    write_atomically(path, write)
+    return path
+
+
+def load_strategy(rules: dict) -> Optional[StrategyTable]:
+    """The cached table for 'rules', or None if it hasn't been solved yet."""
+    try:
+        with open(strategy_path(rules), "rb") as f:
+            return StrategyTable(f.read(), rules)
+    except (OSError, ValueError):
+        return None
+
+
+_loaded = {}
+
+
+def strategy_for(decks: int = 1, **overrides) -> StrategyTable:
+    """
+    The table for DEFAULT_RULES with 'decks' (and any other rule overridden):
+    from memory, else from disk, else solved once and saved.
+    """
+    rules = dict(DEFAULT_RULES, decks=decks, **overrides)
+    key = rules_key(rules)
+    table = _loaded.get(key)
+    if table is None:
+        table = load_strategy(rules)
+        if table is None:
+            table = solve(rules)
+            # A cache that can't be written only costs a solve on the next start
+            try:
+                save_strategy(table)
+            except OSError as e:
+                print(f"Warning: could not write the strategy table: {e}")
+        _loaded[key] = table
+    return table
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    rules = dict(DEFAULT_RULES, decks=int(sys.argv[1]) if len(sys.argv) > 1 else 1)
+
+    start = time.perf_counter()
+    table = solve(rules)
+    solved = time.perf_counter() - start
+    path = save_strategy(table)
+
+    start = time.perf_counter()
+    load_strategy(rules)
+    loaded = time.perf_counter() - start
+
+    print(table.chart())
+    print(f"{path}: solve {solved * 1000:.1f} ms, load {loaded * 1000:.2f} ms")
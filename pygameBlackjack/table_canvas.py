@@ -0,0 +1,73 @@
+"""
+Canvas-based table for the Tk versions.
+
+Seats and cards are items on one tk.Canvas. A card slot's image item is
+created on first use and re-pointed afterwards; all of them carry the
+"card" tag, so clear_cards() is a single Tk call.
+"""
+import tkinter as tk
+
+
+class Seat:
+    """Position of one participant on the canvas and the card items it owns."""
+
+    def __init__(self, title: str, x: int, y: int, width: int, title_item: int, frame_item: int):
+        self.title = title
+        self.x = x
+        self.y = y
+        self.width = width
+        self.title_item = title_item
+        self.frame_item = frame_item
+        # Image item per card slot, created on first use and reused afterwards
+        self.card_items = []
+
+
+class TableCanvas:
+    def __init__(self, master, width: int, height: int, card_size=(126,182), card_step=50,
+                 bg="#0B3B0B", fg="white", font=("Verdana", 17, "bold")):
+        self.canvas = tk.Canvas(master, width=width, height=height, bg=bg, highlightthickness=0)
+        self.card_size = card_size
+        # Horizontal distance between two cards of the same hand (cards overlap like a fan)
+        self.card_step = card_step
+        self.fg = fg
+        self.font = font
+        self.seats = []
+
+    def pack(self, **kw):
+        self.canvas.pack(**kw)
+
+    def add_seat(self, title: str, x: int, y: int, max_cards=5, pad=7) -> Seat:
+        """
+        Adds a seat whose frame is centered on 'x' with its top at 'y'.
+        The frame is sized for 'max_cards' cards; more cards still fit, they just run past it.
+        """
+        w, h = self.card_size
+        width = w + (max_cards - 1) * self.card_step + 2 * pad
+        left = x - width // 2
+        frame_item = self.canvas.create_rectangle(left, y, left + width, y + h + 2 * pad + 14,
+                                                  outline=self.fg, width=2)
+        title_item = self.canvas.create_text(x, y, text=title, fill=self.fg, font=self.font)
+        seat = Seat(title, left + pad, y + pad + 14, width, title_item, frame_item)
+        self.seats.append(seat)
+        return seat
+
+    def add_text(self, x: int, y: int, text: str, font=("Verdana", 14, "bold"), fill=None) -> int:
+        return self.canvas.create_text(x, y, text=text, fill=fill or self.fg, font=font)
+
+    def set_text(self, item: int, text: str):
+        self.canvas.itemconfigure(item, text=text)
+
+    def set_visible(self, item: int, visible: bool):
+        self.canvas.itemconfigure(item, state="normal" if visible else "hidden")
+
+    def set_card(self, seat: Seat, slot: int, image):
+        """Shows 'image' in card slot 'slot' of 'seat', reusing the slot's item if it exists."""
+        items = seat.card_items
+        while len(items) <= slot:
+            x = seat.x + len(items) * self.card_step
+            items.append(self.canvas.create_image(x, seat.y, anchor="nw", state="hidden", tags=("card",)))
+        self.canvas.itemconfigure(items[slot], image=image, state="normal")
+
+    def clear_cards(self):
+        """Hides every card on the table in one call; the items stay around for the next round."""
+        self.canvas.itemconfigure("card", state="hidden")
@@ -0,0 +1,439 @@
+import random
+from typing import Callable, Optional
+
+from cards import CARD_VALUES, FULL_DECK, MAX_CARDS
+from shoe import Shoe
+from strategy import StrategyTable, strategy_for
+
+
+class Player:
+    """
+    Represents a single participant in the game (including bots and dealer).
+    Stores name, card ids and values; views keep their own widgets per participant.
+    Images are never stored per seat: views resolve card ids through a shared registry.
+    """
+    def __init__(self, name: str, is_bot=False, is_dealer=False):
+        self.name = name
+        self.is_bot = is_bot
+        self.is_dealer = is_dealer
+
+        # Card ids as dealt (see cards.py)
+        self.cards = []
+        # List of integer card values as dealt, e.g. [10, 11, 4]
+        self.cards_values = []
+        # Index (0..4) of the next card slot
+        self.spot = 0
+
+        # Running hand state, updated in add_card_value:
+        #   hard_total - sum with every Ace counted as 1
+        #   soft_aces  - Aces currently counted as 11 (0 or 1 once normalized)
+        #   best_total - hard_total + 10 * soft_aces, never over 21 while an Ace can drop
+        self.hard_total = 0
+        self.soft_aces = 0
+        self.best_total = 0
+
+    def reset(self):
+        """Resets the player's state (called at the start of a new round)."""
+        self.cards.clear()
+        self.cards_values.clear()
+        self.spot = 0
+        self.hard_total = 0
+        self.soft_aces = 0
+        self.best_total = 0
+
+    def add_card(self, card: int) -> bool:
+        """Adds a dealt card id; returns False if there's no space."""
+        if not self.add_card_value(CARD_VALUES[card]):
+            return False
+        self.cards.append(card)
+        return True
+
+    def add_card_value(self, value: int) -> bool:
+        """
+        Adds 'value' (the card's point value) to the player's card list.
+        Returns True if the card was successfully added, or False if there's no space.
+        """
+        if self.spot >= MAX_CARDS:
+            return False
+        self.cards_values.append(value)
+        self.spot += 1
+
+        if value == 11:
+            self.hard_total += 1
+            self.soft_aces += 1
+        else:
+            self.hard_total += value
+        best = self.hard_total + 10 * self.soft_aces
+        # At most one soft Ace survives a normalized hand, so this runs once or twice
+        while best > 21 and self.soft_aces:
+            self.soft_aces -= 1
+            best -= 10
+        self.best_total = best
+        return True
+
+    def set_cards(self, cards):
+        """Replaces the hand with card ids (e.g. when loading a saved game), rebuilding values and totals."""
+        self.reset()
+        for card in cards:
+            self.add_card(card)
+
+    def calculate_total(self) -> int:
+        """Returns the best total of the hand (Aces count as 1 when 11 would bust)."""
+        return self.best_total
+
+    def is_soft(self) -> bool:
+        """Returns True if an Ace is currently counted as 11."""
+        return self.soft_aces > 0
+
+    def is_bust(self) -> bool:
+        """Returns True if the player's total exceeds 21 (bust)."""
+        return self.best_total > 21
+
+    def bot_decision(self, dealer_upcard: Optional[int], rng=random,
+                     strategy: Optional[StrategyTable] = None) -> bool:
+        """
+        Bot AI logic. With a solved 'strategy' table the bot plays its entry (O(1) lookup).
+        Without one it falls back to the old thresholds:
+          1) If total < 12, always hit.
+          2) If total >= 19, stand.
+          3) For totals in [12..18], hit with a certain probability:
+             if dealer_upcard <= 6 => 30% chance; else => 60%.
+        Returns True if the bot wants to hit, False if it stands.
+        """
+        total = self.best_total
+
+        if self.spot >= MAX_CARDS or total > 21:
+            return False
+
+        # If the dealer upcard is unknown, assume 7
+        if dealer_upcard is None:
+            dealer_upcard = 7
+
+        if strategy is not None:
+            return strategy.should_hit(total, self.is_soft(), dealer_upcard, self.spot)
+
+        if total < 12:
+            return True
+        elif total >= 19:
+            return False
+        else:
+            # total in [12..18]
+            if dealer_upcard <= 6:
+                chance_to_hit = 0.3
+            else:
+                chance_to_hit = 0.6
+            return (rng.random() < chance_to_hit)
+
+
+# Four seats with at most five cards each
+MAX_CARDS_PER_ROUND = 20
+
+# Marks "use the strategy solved for this engine's rules", since None means the old thresholds
+_DEFAULT = object()
+
+
+class TableEngine:
+    """
+    Headless Blackjack rules: deck, hands, bot turns, dealer play and settlement.
+
+    The engine never touches Tk. A view (like blackjack_v7.Game) subscribes to
+    the events below and draws whatever it needs:
+      - "shuffle"     ()  -> the shoe was reshuffled before a round
+      - "round_start" ()
+      - "card"        (person, card)  -> card id (see cards.py), already added to person
+      - "deck_empty"  ()
+      - "summary"     (dealer_total, player_total, player_outcome, bot1_result, bot2_result)
+      - "result"      (title, text, outcome) -> outcome is "player", "dealer" or "tie"
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None, decks: int = 1,
+                 penetration: float = 0.75, bot_strategy=_DEFAULT):
+        # Global scores
+        self.player_wins = 0
+        self.dealer_wins = 0
+        self.ties = 0
+
+        self.rng = rng if rng is not None else random.Random()
+        # The shoe persists across rounds and is reshuffled at the cut card
+        self.deck = Shoe(FULL_DECK, self.rng, decks=decks, penetration=penetration)
+
+        # Create participants
+        self.dealer = Player("Dealer", is_dealer=True)
+        self.player = Player("Player")
+        self.bot1 = Player("Bot1", is_bot=True)
+        self.bot2 = Player("Bot2", is_bot=True)
+
+        self.players = [self.dealer, self.bot1, self.player, self.bot2]
+
+        # Bots play the hit/stand table solved for these rules (cached on disk);
+        # bot_strategy=None brings back Player.bot_decision's random thresholds
+        if bot_strategy is _DEFAULT:
+            bot_strategy = strategy_for(decks)
+        self.bot_strategy = bot_strategy
+
+        # Track blackjack/bust status for dealer/player only
+        self.blackjack_status = {"dealer": "no", "player": "no"}
+        # True once the player's outcome has been settled for this round
+        self.round_over = True
+        # "player", "dealer" or "tie" once the round is over
+        self.outcome = None
+
+        self._listeners = {}
+
+    # ---------------------- events ----------------------
+    def subscribe(self, event: str, callback: Callable):
+        """Registers 'callback' to be called every time 'event' is emitted."""
+        self._listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event: str, *args):
+        for callback in self._listeners.get(event, ()):
+            callback(*args)
+
+    # ---------------------- round flow ----------------------
+    def shuffle_deck(self):
+        """
+        Starts a new round: reshuffles the shoe if the cut card came out (or a
+        full round might not fit in what's left), resets all players, and deals
+        initial cards.
+        """
+        if self.deck.needs_shuffle() or len(self.deck) < MAX_CARDS_PER_ROUND:
+            self.deck.shuffle()
+            self.emit("shuffle")
+
+        for p in self.players:
+            p.reset()
+        self.blackjack_status = {"dealer": "no", "player": "no"}
+        self.round_over = False
+        self.outcome = None
+        self.emit("round_start")
+
+        self.deal_card_to(self.dealer)
+        self.deal_card_to(self.dealer)
+        self.deal_card_to(self.player)
+        self.deal_card_to(self.player)
+        self.deal_card_to(self.bot1)
+        self.deal_card_to(self.bot1)
+        self.deal_card_to(self.bot2)
+        self.deal_card_to(self.bot2)
+
+        self.check_immediate_outcomes()
+
+    def restore_round(self, round_over: Optional[bool] = None, outcome: Optional[str] = None):
+        """
+        Rebuilds the round state from hands set directly (e.g. loaded from a save).
+        Without 'round_over', a 21 or a player bust means the round was already settled.
+        """
+        self.blackjack_status = {"dealer": "no", "player": "no"}
+        self.update_status("player")
+        self.update_status("dealer")
+        if round_over is None:
+            round_over = "yes" in self.blackjack_status.values() or self.blackjack_status["player"] == "bust"
+        self.round_over = round_over
+        self.outcome = outcome if round_over else None
+
+    def deal_card_to(self, person: Player) -> Optional[int]:
+        """
+        Deals one card to the given 'person' (dealer/bot/player).
+        Returns the card id, or None if nothing was dealt.
+        """
+        if len(self.deck) == 0:
+            self.emit("deck_empty")
+            return None
+        if person.spot >= MAX_CARDS:
+            return None
+
+        card = self.deck.deal()
+        person.add_card(card)
+
+        if person is self.player:
+            self.update_status("player")
+        elif person.is_dealer:
+            self.update_status("dealer")
+
+        self.emit("card", person, card)
+        return card
+
+    def update_status(self, player_type: str):
+        """Marks 'player' or 'dealer' as having reached 21 ("yes") or bust."""
+        person = self.player if player_type == "player" else self.dealer
+        total = person.best_total
+        if total == 21:
+            self.blackjack_status[player_type] = "yes"
+        elif total > 21:
+            self.blackjack_status[player_type] = "bust"
+
+    def check_immediate_outcomes(self):
+        """
+        Ends the round early if the dealer or the player hit 21, or the player busted.
+        """
+        if self.round_over:
+            return
+
+        p_status = self.blackjack_status["player"]
+        d_status = self.blackjack_status["dealer"]
+        p_total = self.player.calculate_total()
+
+        if d_status == "yes" and p_status == "yes":
+            self.settle("Push!", "It's a tie! Both have 21.", "tie")
+        elif d_status == "yes":
+            self.settle("Dealer Wins!", "Dealer got 21!", "dealer")
+        elif p_status == "yes":
+            self.settle("Player Wins!", "Player got 21!", "player")
+        elif p_status == "bust":
+            self.settle("Player Bust!", f"Player is over 21! Total: {p_total}", "dealer")
+
+    def player_hit(self) -> bool:
+        """'Hit Me!' => give a card to the player. Returns False if no card could be dealt."""
+        if self.round_over:
+            return False
+        if self.deal_card_to(self.player) is None:
+            return False
+        self.check_immediate_outcomes()
+        return True
+
+    def stand(self):
+        """
+        When the player stands:
+          - Bots take their turns
+          - Dealer takes cards until total >= 17
+          - Compare results and settle the round
+        """
+        if self.round_over:
+            return
+
+        self.play_for_bot(self.bot1)
+        self.play_for_bot(self.bot2)
+
+        while True:
+            if self.dealer.best_total < 17 and self.dealer.spot < MAX_CARDS:
+                if self.deal_card_to(self.dealer) is None:
+                    break
+            else:
+                break
+
+        self.final_comparison()
+
+    def play_for_bot(self, bot: Player):
+        """Bot's logic: repeat while the bot decides to hit."""
+        while True:
+            if bot.best_total > 21 or bot.spot >= MAX_CARDS:
+                break
+            dealer_upcard = None
+            if len(self.dealer.cards_values) > 0:
+                dealer_upcard = self.dealer.cards_values[0]
+
+            if bot.bot_decision(dealer_upcard, self.rng, self.bot_strategy):
+                if self.deal_card_to(bot) is None:
+                    break
+            else:
+                break
+
+    def final_comparison(self):
+        """
+        Compare player's and dealer's totals, also compare each bot to the dealer.
+        """
+        d_total = self.dealer.best_total
+        dealer_bust = (d_total > 21)
+
+        p_total = self.player.best_total
+        player_bust = (p_total > 21)
+
+        bot1_result = self.compare_with_dealer(self.bot1)
+        bot2_result = self.compare_with_dealer(self.bot2)
+
+        if dealer_bust:
+            # A bot that busted first still loses; compare_with_dealer already says so
+            self.emit("summary", d_total, p_total, "Win (Dealer Bust)", bot1_result, bot2_result)
+            self.settle("Player Wins!", f"Dealer busted! Player total: {p_total}", "player")
+            return
+
+        if player_bust:
+            player_outcome = "Bust"
+            outcome_for_stats = "dealer"
+        elif p_total > d_total:
+            player_outcome = "Win"
+            outcome_for_stats = "player"
+        elif p_total < d_total:
+            player_outcome = "Lose"
+            outcome_for_stats = "dealer"
+        else:
+            player_outcome = "Tie"
+            outcome_for_stats = "tie"
+
+        self.emit("summary", d_total, p_total, player_outcome, bot1_result, bot2_result)
+
+        if outcome_for_stats == "player":
+            self.settle("Player Wins!", f"Player: {p_total}, Dealer: {d_total}", "player")
+        elif outcome_for_stats == "dealer":
+            self.settle("Dealer Wins!", f"Dealer: {d_total}, Player: {p_total}", "dealer")
+        else:
+            self.settle("Push!", f"Tie! Dealer: {d_total}, Player: {p_total}", "tie")
+
+    def compare_with_dealer(self, bot: Player) -> str:
+        """
+        Returns the result for a bot: 'Bust', 'Win', 'Lose', or 'Tie'.
+        """
+        b_total = bot.best_total
+        if b_total > 21:
+            return "Bust"
+
+        d_total = self.dealer.best_total
+        if d_total > 21:
+            return "Win (Dealer Bust)"
+
+        if b_total > d_total:
+            return "Win"
+        elif b_total < d_total:
+            return "Lose"
+        else:
+            return "Tie"
+
+    def settle(self, title: str, text: str, outcome: str):
+        """Ends the round and updates the global stats."""
+        self.round_over = True
+        self.outcome = outcome
+        if outcome == "player":
+            self.player_wins += 1
+        elif outcome == "dealer":
+            self.dealer_wins += 1
+        elif outcome == "tie":
+            self.ties += 1
+        self.emit("result", title, text, outcome)
+
+    # ---------------------- batch helpers ----------------------
+    def play_round(self, player_policy: Optional[Callable[['TableEngine'], bool]] = None) -> str:
+        """
+        Plays one full round without any UI and returns "player", "dealer" or "tie".
+        'player_policy(engine)' returns True to hit; by default the player stands.
+        """
+        self.shuffle_deck()
+        while not self.round_over and player_policy is not None and player_policy(self):
+            # At the card limit (or with an empty shoe) a hit deals nothing; stand instead
+            if not self.player_hit():
+                break
+        self.stand()
+        return self.outcome
+
+    def get_current_state(self):
+        return {
+            "player_wins": self.player_wins,
+            "dealer_wins": self.dealer_wins,
+            "ties": self.ties,
+            "dealer_cards": self.dealer.cards_values,
+            "player_cards": self.player.cards_values,
+            "bot1_cards": self.bot1.cards_values,
+            "bot2_cards": self.bot2.cards_values
+        }
+
+
+if __name__ == '__main__':
+    import time
+
+    engine = TableEngine(random.Random(0))
+    rounds = 20000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        engine.play_round()
+    elapsed = time.perf_counter() - start
+    print(f"{rounds} rounds in {elapsed:.2f}s ({rounds / elapsed:,.0f} rounds/s)")
+    print(f"Wins: {engine.player_wins}  Losses: {engine.dealer_wins}  Ties: {engine.ties}")
@@ -0,0 +1,176 @@
+"""
+Vectorized agent environment over the TableEngine table rules.
+
+blackjack_v7.Game.step() drives one table through the Tk view. VecTableEnv
+gives the same interface for N independent tables held in NumPy arrays:
+each step() applies one action per table (1 = hit, 0 = stand) to all of
+them at once, using the simulator's vectorized rules (a fresh deck every
+round, the bots and the dealer play on stand). The bots follow
+simulator.BOT_POLICY, the legacy bot rule, unless another bot_policy is given.
+
+A round is one episode. Rounds that the first cards already decide (a 21
+for the dealer or the player) finish on the next step whatever the action.
+Finished tables are dealt a new round straight away, so the returned
+observation is always a live hand (auto-reset, as vector envs usually do).
+
+TableEnv wraps a single table in the Gym-style reset()/step() API without
+depending on gym.
+
+    python table_env.py [tables] [steps]   # throughput of the strategy policy
+"""
+from typing import Optional
+
+import numpy as np
+
+from cards import MAX_CARDS
+from simulator import (BOT_POLICY, DEALER_WINS, DECK_SIZE, DECK_VALUES, OPEN, PLAYER, PLAYER_WINS,
+                       add_cards, best_totals, deal_cards, open_rounds, play_showdown)
+
+HIT, STAND = 1, 0
+# Columns of an observation row
+OBS_FIELDS = ("total", "soft", "upcard", "n_cards")
+
+
+class VecTableEnv:
+    def __init__(self, n_tables: int, seed: Optional[int] = None, bot_policy=BOT_POLICY,
+                 auto_reset: bool = True):
+        self.n_tables = n_tables
+        self.bot_policy = bot_policy
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        # Every table's deck, back to back; it stays a permutation of one deck,
+        # so a new round only has to move the cursor back to the top
+        self.decks = np.tile(DECK_VALUES, n_tables)
+        self.cursor = np.zeros(n_tables, dtype=np.int64)
+        # Per seat (dealer, player, bot1, bot2) and table
+        self.hard = np.zeros((4, n_tables), dtype=np.int64)
+        self.aces = np.zeros((4, n_tables), dtype=bool)
+        self.upcard = np.zeros(n_tables, dtype=np.int64)
+        # Player's cards (values, 0 = empty slot) and how many there are
+        self.hands = np.zeros((n_tables, MAX_CARDS), dtype=np.int64)
+        self.n_cards = np.zeros(n_tables, dtype=np.int64)
+        self.outcome = np.zeros(n_tables, dtype=np.int8)
+        self.done = np.zeros(n_tables, dtype=bool)
+
+        # Instrumentation
+        self.steps = 0
+        self.rounds = 0
+
+    def reset(self) -> np.ndarray:
+        """Deals a new round on every table; returns the observations."""
+        self._deal_new(np.arange(self.n_tables))
+        return self.observe()
+
+    def observe(self) -> np.ndarray:
+        """(n_tables, 4) int array with OBS_FIELDS columns."""
+        total, soft = best_totals(self.hard, self.aces, PLAYER, slice(None))
+        return np.stack((total, soft, self.upcard, self.n_cards), axis=1)
+
+    def step(self, actions):
+        """
+        Applies one action per table. Returns (observations, rewards, dones, outcomes):
+        rewards are +1/-1/0 for tables whose round ended on this step (0 otherwise),
+        outcomes their TableEngine-style codes (PLAYER_WINS, DEALER_WINS, TIE, else OPEN).
+        """
+        actions = np.asarray(actions, dtype=bool)
+        if self.done.any():
+            raise RuntimeError("some tables finished their round; call reset() (or use auto_reset)")
+        self.steps += self.n_tables
+        outcome = self.outcome
+        live = outcome == OPEN
+
+        # Hit: settled at once on 21 or a bust (player_hit / check_immediate_outcomes).
+        # A sixth card is refused, so hitting on five cards stands instead.
+        can_hit = self.n_cards < MAX_CARDS
+        hitting = np.flatnonzero(live & actions & can_hit)
+        if len(hitting):
+            card = deal_cards(self.decks, self.cursor, hitting, self.rng)
+            add_cards(self.hard, self.aces, PLAYER, hitting, card)
+            self.hands[hitting, self.n_cards[hitting]] = card
+            self.n_cards[hitting] += 1
+            total = best_totals(self.hard, self.aces, PLAYER, hitting)[0]
+            outcome[hitting[total == 21]] = PLAYER_WINS
+            outcome[hitting[total > 21]] = DEALER_WINS
+
+        standing = np.flatnonzero(live & ~(actions & can_hit))
+        if len(standing):
+            play_showdown(self.decks, self.cursor, self.hard, self.aces, self.upcard, outcome,
+                      standing, self.bot_policy, self.rng)
+
+        done = outcome != OPEN
+        rewards = np.where(outcome == PLAYER_WINS, 1.0, np.where(outcome == DEALER_WINS, -1.0, 0.0))
+        rewards[~done] = 0.0
+        finished = outcome.copy()
+        self.rounds += int(np.count_nonzero(done))
+
+        if self.auto_reset:
+            self._deal_new(np.flatnonzero(done))
+        else:
+            self.done = done
+        return self.observe(), rewards, done, finished
+
+    def _deal_new(self, rows):
+        if not len(rows):
+            return
+        self.cursor[rows] = 0
+        self.hard[:, rows] = 0
+        self.aces[:, rows] = False
+        self.hands[rows] = 0
+        self.done[rows] = False
+        open_rounds(self.decks, self.cursor, self.hard, self.aces, self.upcard, self.outcome,
+                     rows, self.rng)
+        # The player's first two cards are the 3rd and 4th of DEAL_ORDER
+        self.hands[rows, :2] = self.decks[rows[:, None] * DECK_SIZE + np.array([2, 3])]
+        self.n_cards[rows] = 2
+
+
+class TableEnv:
+    """
+    One table with the Gym-style API: reset() -> (obs, info) and
+    step(action) -> (obs, reward, terminated, truncated, info). One round per episode.
+    """
+
+    def __init__(self, seed: Optional[int] = None, bot_policy=BOT_POLICY):
+        self.env = VecTableEnv(1, seed, bot_policy, auto_reset=False)
+
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.env.rng = np.random.default_rng(seed)
+        obs = self.env.reset()[0]
+        return obs, {"settled": bool(self.env.outcome[0] != OPEN)}
+
+    def step(self, action: int):
+        obs, rewards, dones, outcomes = self.env.step([action])
+        info = {"outcome": int(outcomes[0]), "hand": self.env.hands[0, :self.env.n_cards[0]].tolist()}
+        return obs[0], float(rewards[0]), bool(dones[0]), False, info
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from strategy import strategy_for
+
+    n_tables = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 16
+    n_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    policy = strategy_for(1).policy_table()
+    env = VecTableEnv(n_tables, seed=0)
+    obs = env.reset()
+    won = 0.0
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        actions = policy[obs[:, 1], obs[:, 0], obs[:, 2]] > 0.5
+        obs, rewards, dones, _ = env.step(actions)
+        won += rewards.sum()
+    elapsed = time.perf_counter() - start
+    print(f"{n_tables:,} tables x {n_steps} steps: {env.steps / elapsed:,.0f} table-steps/s, "
+          f"{env.rounds:,} rounds, EV {won / env.rounds:+.4f} per round")
+
+    single = TableEnv(seed=0)
+    obs, info = single.reset()
+    terminated = False
+    while not terminated:
+        obs, reward, terminated, truncated, info = single.step(HIT if obs[0] < 17 else STAND)
+    print(f"single table: hand {info['hand']} -> reward {reward:+.0f}")
@@ -0,0 +1,61 @@
+"""
+Rendered text surfaces and frame timing for the pygame versions.
+
+TextCache keeps surfaces in a bounded LRU keyed by (font, text, antialias,
+color). FrameTimer measures drawing time per frame; the games print it on
+exit in debug mode (see debug.py).
+"""
+import time
+from collections import OrderedDict
+
+
+class TextCache:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Same as font.render(text, antialias, color), but cached."""
+        key = (font, text, antialias, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+class FrameTimer:
+    """Accumulates time spent drawing, per frame."""
+
+    def __init__(self):
+        self.frames = 0
+        self.total = 0.0
+        self._start = 0.0
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self.total += time.perf_counter() - self._start
+        self.frames += 1
+
+    def report(self) -> str:
+        avg_ms = self.total / self.frames * 1000 if self.frames else 0.0
+        return f"{self.frames} frames drawn, {avg_ms:.3f} ms per frame on average"
+
+
+# Shared by every draw function in the process
+text_cache = TextCache()
+render_text = text_cache.render
@@ -0,0 +1,68 @@
+"""
+Non-modal, in-window notifications for the Tk versions.
+
+Toasts stack at the top of the window; a click, or an optional timeout,
+dismisses one.
+"""
+import tkinter as tk
+from typing import Optional
+
+# Marks "use the manager's default timeout", since None already means "no timeout"
+_DEFAULT = object()
+
+
+class ToastManager:
+    def __init__(self, root, bg="#F5F5DC", fg="black", timeout_ms: Optional[int] = None,
+                 rely=0.08):
+        self.root = root
+        self.bg = bg
+        self.fg = fg
+        # Default auto-dismiss delay; None keeps a toast until it's clicked or cleared
+        self.timeout_ms = timeout_ms
+        self.rely = rely
+        # Toasts are packed into this holder, which is only placed while one is visible
+        self.holder = tk.Frame(root, bg=root.cget("bg"))
+        self.toasts = []
+
+    def show(self, title: str, text: str, timeout_ms=_DEFAULT):
+        """
+        Shows a toast below any that are already visible and returns its frame.
+        'timeout_ms' overrides the manager's default (None = never auto-dismiss).
+        """
+        if timeout_ms is _DEFAULT:
+            timeout_ms = self.timeout_ms
+
+        frame = tk.Frame(self.holder, bg=self.bg, bd=2, relief="ridge")
+        frame.pack(pady=4)
+        title_lbl = tk.Label(frame, text=title, bg=self.bg, fg=self.fg, font=("Verdana", 14, "bold"))
+        title_lbl.pack(padx=14, pady=(7, 0))
+        text_lbl = tk.Label(frame, text=text.rstrip("\n"), bg=self.bg, fg=self.fg,
+                            font=("Verdana", 11), justify="left")
+        text_lbl.pack(padx=14, pady=(0, 7))
+
+        for widget in (frame, title_lbl, text_lbl):
+            widget.bind("<Button-1>", lambda event, f=frame: self.dismiss(f))
+
+        frame.after_id = None
+        if timeout_ms is not None:
+            frame.after_id = self.root.after(timeout_ms, self.dismiss, frame)
+
+        self.toasts.append(frame)
+        self.holder.place(relx=0.5, rely=self.rely, anchor="n")
+        self.holder.lift()
+        return frame
+
+    def dismiss(self, frame):
+        if frame not in self.toasts:
+            return
+        self.toasts.remove(frame)
+        if frame.after_id is not None:
+            self.root.after_cancel(frame.after_id)
+        frame.destroy()
+        if not self.toasts:
+            self.holder.place_forget()
+
+    def clear(self):
+        """Dismisses every toast (e.g. when a new round starts)."""
+        for frame in list(self.toasts):
+            self.dismiss(frame)